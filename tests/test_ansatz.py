@@ -0,0 +1,50 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from qiskit.circuit.library import TwoLocal
+from qiskit.quantum_info import Statevector
+
+from volta.ansatz import ParameterBinder, get_var_form, get_num_parameters
+
+
+class TestParameterBinder(unittest.TestCase):
+    def setUp(self):
+        self.ansatz = TwoLocal(2, ["ry", "rz"], "cx", reps=1)
+        self.binder = ParameterBinder(self.ansatz)
+        self.params_batch = np.random.RandomState(0).rand(3, self.binder.num_parameters)
+
+    def test_bind_batch(self):
+        parameters = sorted(self.ansatz.parameters, key=lambda p: p.name)
+        circuits = self.binder.bind_batch(self.params_batch)
+        decimalPlace = 6
+        message = "Parameter binder not matching assign_parameters."
+        for params, circuit in zip(self.params_batch, circuits):
+            want = Statevector(
+                self.ansatz.assign_parameters(dict(zip(parameters, params)))
+            ).data
+            got = Statevector(circuit).data
+            self.assertAlmostEqual(
+                1.0, np.abs(np.vdot(want, got)), decimalPlace, message
+            )
+
+    def test_wrong_number_of_parameters(self):
+        with self.assertRaises(AssertionError):
+            self.binder.bind([0.0])
+
+    def test_var_form(self):
+        params = self.params_batch[0]
+        self.assertEqual(len(params), get_num_parameters(2))
+        self.assertEqual(0, len(get_var_form(params, n_qubits=2).parameters))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
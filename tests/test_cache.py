@@ -0,0 +1,59 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from volta.cache import CostCache
+
+
+class TestCostCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def _function(self, params):
+        self.calls += 1
+        return float(np.sum(params)) + self.calls
+
+    def test_reuse(self):
+        cache = CostCache(tolerance=1e-6)
+        want = cache.get_or_evaluate(self._function, [0.1, 0.2])
+        got = cache.get_or_evaluate(self._function, [0.1 + 1e-9, 0.2])
+        message = "Cache not reusing a near-identical point."
+        self.assertEqual(want, got, message)
+        self.assertEqual(1, self.calls)
+        self.assertEqual(1, cache.statistics["hits"])
+        self.assertEqual(1, cache.statistics["misses"])
+
+    def test_resample(self):
+        cache = CostCache(tolerance=1e-6, mode="resample")
+        cache.get_or_evaluate(self._function, [0.0])
+        got = cache.get_or_evaluate(self._function, [0.0])
+        want = (1.0 + 2.0) / 2
+        decimalPlace = 6
+        message = "Cache not averaging the samples of a point."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+        self.assertEqual(2, self.calls)
+
+    def test_eviction(self):
+        cache = CostCache(maxsize=2)
+        for x in [0.0, 1.0, 0.0, 2.0]:
+            cache.get_or_evaluate(self._function, [x])
+        message = "Cache not evicting the least recently used point."
+        self.assertEqual(2, len(cache), message)
+        cache.get_or_evaluate(self._function, [1.0])
+        self.assertEqual(4, self.calls, message)
+
+    def test_not_implemented_mode(self):
+        with self.assertRaises(NotImplementedError):
+            CostCache(mode="test")
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
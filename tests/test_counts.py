@@ -0,0 +1,78 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from volta.counts import (
+    counts_to_arrays,
+    parity_expectations,
+    marginal,
+    swap_test_fidelity,
+    dswap_test_fidelity,
+    amplitude_transition_fidelity,
+    wilson_half_width,
+)
+
+
+class TestCounts(unittest.TestCase):
+    def setUp(self):
+        self.outcomes, self.weights = counts_to_arrays(
+            {"00": 40, "01": 30, "10": 20, "11": 10}
+        )
+
+    def test_parity(self):
+        want = [0.4 + 0.2 - 0.3 - 0.1, 0.4 + 0.3 - 0.2 - 0.1, 0.4 - 0.3 - 0.2 + 0.1]
+        got = parity_expectations(self.outcomes, self.weights, np.array([1, 2, 3]))
+        message = "Parity expectation values not working."
+        self.assertTrue(np.allclose(want, got), message)
+
+    def test_marginal(self):
+        outcomes, weights = marginal(self.outcomes, self.weights, [1])
+        message = "Marginal distribution not working."
+        self.assertEqual([0, 1], list(outcomes), message)
+        self.assertEqual([70.0, 30.0], list(weights), message)
+
+    def test_swap(self):
+        want = 0.5
+        got = swap_test_fidelity(*counts_to_arrays({"0": 75, "1": 25}))
+        message = "SWAP test estimator not working."
+        self.assertAlmostEqual(want, got, 7, message)
+
+    def test_dswap(self):
+        # One pair measured as 11 out of two pairs
+        want = 0.0
+        got = dswap_test_fidelity(*counts_to_arrays({"0011": 10}), 2)
+        message = "Destructive SWAP test estimator not working."
+        self.assertAlmostEqual(want, got, 7, message)
+
+    def test_amplitude(self):
+        want = 0.4
+        got = amplitude_transition_fidelity(self.outcomes, self.weights)
+        message = "Amplitude transition estimator not working."
+        self.assertAlmostEqual(want, got, 7, message)
+
+
+class TestWilson(unittest.TestCase):
+    def test_half_width(self):
+        # Interval of 0.5 with 100 shots at z = 1.96 is [0.4038, 0.5962]
+        want = 0.0962
+        got = wilson_half_width(0.5, 100, 1.96)
+        decimalPlace = 4
+        message = "Wilson interval not working for p = 0.5."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+    def test_zero_probability(self):
+        got = wilson_half_width(0.0, 100, 1.96)
+        message = "Wilson interval should not vanish for p = 0."
+        self.assertGreater(got, 0.0, message)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
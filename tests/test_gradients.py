@@ -0,0 +1,60 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.circuit.library import TwoLocal
+
+from volta.gradients import ParameterShiftGradient
+from volta.hamiltonians import BCS_hamiltonian
+from volta.statevector import ExactExpectationEvaluator
+
+
+class TestParameterShiftGradient(unittest.TestCase):
+    def setUp(self):
+        self.hamiltonian = BCS_hamiltonian([1.0, 2.0], 0.5)
+        self.ansatz = TwoLocal(2, ["ry", "rz"], "cx", reps=1)
+        self.evaluator = ExactExpectationEvaluator(self.hamiltonian, self.ansatz)
+        self.params = np.random.RandomState(3).rand(self.evaluator.num_parameters)
+
+    def test_finite_differences(self):
+        engine = ParameterShiftGradient(self.ansatz)
+        shifted = engine.shifted_parameters(self.params)
+        got = engine.gradient_from_values(self.evaluator.evaluate_batch(shifted))
+
+        eps = 1e-6
+        want = np.array(
+            [
+                (
+                    self.evaluator.evaluate(self.params + eps * e)
+                    - self.evaluator.evaluate(self.params - eps * e)
+                )
+                / (2 * eps)
+                for e in np.eye(len(self.params))
+            ]
+        )
+        decimalPlace = 5
+        message = "Parameter-shift gradient not matching finite differences."
+        for w, g in zip(want, got):
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_repeated_parameter(self):
+        theta = Parameter("theta")
+        qc = QuantumCircuit(1)
+        qc.ry(theta, 0)
+        qc.rx(theta, 0)
+        with self.assertRaises(ValueError):
+            ParameterShiftGradient(qc)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
@@ -0,0 +1,122 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import qiskit
+
+from unittest import mock
+
+from qiskit import BasicAer
+from qiskit.opflow import I, X, Z
+from qiskit.utils import QuantumInstance
+
+from volta import utils
+from volta.hamiltonians import BCS_hamiltonian
+from volta.grouping import (
+    group_qubitwise_commuting,
+    group_basis,
+    GroupedExpectationEvaluator,
+    sample_hamiltonian_grouped,
+)
+
+
+class TestGrouping(unittest.TestCase):
+    def test_groups(self):
+        labels = ["ZI", "IZ", "ZZ", "XX", "YY", "XI"]
+        want = [[0, 1, 2], [3, 5], [4]]
+        got = group_qubitwise_commuting(labels)
+        message = "Qubit-wise commuting grouping not working."
+        self.assertEqual(want, got, message)
+
+    def test_basis(self):
+        want = "XZ"
+        got = group_basis(["XI", "IZ", "XZ"])
+        message = "Basis of a qubit-wise commuting group not working."
+        self.assertEqual(want, got, message)
+
+
+class TestGroupedExpectation(unittest.TestCase):
+    def setUp(self):
+        # Simulator
+        self.backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"), shots=10000
+        )
+
+        # |01> state
+        self.qc = qiskit.QuantumCircuit(2)
+        self.qc.x(0)
+
+    def test_BCS_groups(self):
+        hamiltonian = BCS_hamiltonian([1.0, 2.0], 1.0)
+        evaluator = GroupedExpectationEvaluator(hamiltonian, self.backend, self.qc)
+        want = 3
+        got = evaluator.num_groups
+        message = "BCS hamiltonian should be measured with three groups."
+        self.assertEqual(want, got, message)
+
+    def test_energy(self):
+        hamiltonian = 2.0 * (Z ^ I) + 0.5 * (I ^ Z) + (Z ^ Z) + 0.3 * (I ^ I)
+        want = 2.0 - 0.5 - 1.0 + 0.3
+        got = sample_hamiltonian_grouped(hamiltonian, self.backend, self.qc)
+        decimalPlace = 2
+        message = "Grouped measurement not working for state |01>."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+    def test_shot_budget(self):
+        hamiltonian = 2.0 * (Z ^ I) + 0.5 * (X ^ X)
+        evaluator = GroupedExpectationEvaluator(
+            hamiltonian, self.backend, self.qc, shot_budget=20000
+        )
+        want = 2.0
+        got = evaluator.evaluate([])
+        decimalPlace = 1
+        message = "Grouped measurement with a shot budget not working for state |01>."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+        # The ZI group has no variance on |01>
+        for _ in range(3):
+            evaluator.evaluate([])
+        shots = evaluator.shot_allocator.allocate()
+        self.assertEqual(20000, sum(shots))
+        self.assertGreater(shots[1], shots[0])
+
+    def test_shot_budget_submissions(self):
+        hamiltonian = 2.0 * (Z ^ I) + 0.5 * (X ^ X)
+        evaluator = GroupedExpectationEvaluator(
+            hamiltonian, self.backend, self.qc, shot_budget=20000
+        )
+        evaluator.shot_allocator.update([0.1, 1.0])
+        shots = evaluator.shot_allocator.allocate()
+
+        with mock.patch.object(
+            utils, "_run_circuits", wraps=utils._run_circuits
+        ) as run_circuits:
+            evaluator.evaluate([])
+
+        message = "Groups should run with one submission for each number of shots."
+        self.assertEqual(len(set(shots)), run_circuits.call_count, message)
+
+        message = "Groups should run with their own number of shots."
+        got = [call[0][2] for call in run_circuits.call_args_list]
+        self.assertEqual(sorted(set(shots)), sorted(got), message)
+
+    def test_XY_energy(self):
+        # XX and YY expectation values of 1
+        qc = qiskit.QuantumCircuit(2)
+        qc.h(range(2))
+        hamiltonian = (X ^ X) + (Z ^ Z)
+        want = 1.0
+        got = sample_hamiltonian_grouped(hamiltonian, self.backend, qc)
+        decimalPlace = 1
+        message = "Grouped measurement not working for state Plus^Plus."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
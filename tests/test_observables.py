@@ -9,12 +9,21 @@
 
 import unittest
 import qiskit
+import numpy as np
 
 from qiskit import BasicAer
+from qiskit.circuit import Parameter
 from qiskit.opflow import X, Y, Z
 from qiskit.utils import QuantumInstance
 
-from volta.observables import sample_hamiltonian
+from volta.hand_observables import measure_paulis
+from volta.paulis import PauliSum
+from volta.observables import (
+    sample_hamiltonian,
+    sample_hamiltonian_batch,
+    ExpectationEvaluator,
+    SubspaceExpectationEvaluator,
+)
 
 
 class TestObservables(unittest.TestCase):
@@ -67,5 +76,135 @@ class TestObservables(unittest.TestCase):
         self.assertAlmostEqual(want, got, decimalPlace, message)
 
 
+class TestExpectationEvaluator(unittest.TestCase):
+    def setUp(self):
+        # Simulator
+        self.backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"), shots=10000
+        )
+
+        # ZZ expectation value of cos(theta)
+        theta = Parameter("theta")
+        self.ansatz = qiskit.QuantumCircuit(2)
+        self.ansatz.ry(theta, 0)
+
+        self.evaluator = ExpectationEvaluator(Z ^ Z, self.backend, self.ansatz)
+
+    def test_reuse(self):
+        decimalPlace = 1
+        for theta in [0.0, np.pi / 3, np.pi]:
+            want = np.cos(theta)
+            got = self.evaluator.evaluate([theta])
+            message = f"ExpectationEvaluator not working for theta={theta}."
+            self.assertAlmostEqual(want, got, decimalPlace, message)
+
+    def test_batch(self):
+        decimalPlace = 1
+        thetas = np.array([[0.0], [np.pi / 3], [np.pi]])
+        want = np.cos(thetas[:, 0])
+        got = sample_hamiltonian_batch(Z ^ Z, self.backend, self.ansatz, thetas)
+        self.assertEqual(got.shape, (3,))
+        for w, g in zip(want, got):
+            message = "sample_hamiltonian_batch not working for Z^Z."
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_wrong_number_of_parameters(self):
+        with self.assertRaises(AssertionError):
+            self.evaluator.evaluate([0.0, 1.0])
+
+
+class TestSubspaceExpectationEvaluator(unittest.TestCase):
+    def setUp(self):
+        # Simulator
+        self.backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"), shots=10000
+        )
+
+        # ZZ expectation values of cos(theta) and -cos(theta)
+        theta = Parameter("theta")
+        state_0 = qiskit.QuantumCircuit(2)
+        state_0.ry(theta, 0)
+
+        state_1 = qiskit.QuantumCircuit(2)
+        state_1.x(1)
+        state_1.ry(theta, 0)
+
+        self.circuits = [state_0, state_1]
+        self.evaluator = SubspaceExpectationEvaluator(
+            Z ^ Z, self.backend, self.circuits
+        )
+
+    def test_evaluate(self):
+        decimalPlace = 1
+        theta = np.pi / 3
+        want = [np.cos(theta), -np.cos(theta)]
+        got = self.evaluator.evaluate([theta])
+        self.assertEqual(got.shape, (2,))
+        for w, g in zip(want, got):
+            message = "SubspaceExpectationEvaluator not working for Z^Z."
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_batch(self):
+        decimalPlace = 1
+        thetas = np.array([[0.0], [np.pi / 3], [np.pi]])
+        got = self.evaluator.evaluate_batch(thetas)
+        self.assertEqual(got.shape, (3, 2))
+        for theta, values in zip(thetas[:, 0], got):
+            for w, g in zip([np.cos(theta), -np.cos(theta)], values):
+                message = (
+                    f"SubspaceExpectationEvaluator batch not working for theta={theta}."
+                )
+                self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_statevector(self):
+        backend = QuantumInstance(backend=BasicAer.get_backend("statevector_simulator"))
+        evaluator = SubspaceExpectationEvaluator(Z ^ Z, backend, self.circuits)
+        theta = np.pi / 3
+        want = [np.cos(theta), -np.cos(theta)]
+        got = evaluator.evaluate([theta])
+        decimalPlace = 6
+        for w, g in zip(want, got):
+            message = "SubspaceExpectationEvaluator not working on statevectors."
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_pauli_sum(self):
+        # Shot-based backend with a PauliSum hamiltonian
+        evaluator = SubspaceExpectationEvaluator(
+            PauliSum.from_labels(["ZZ"]), self.backend, self.circuits
+        )
+        decimalPlace = 1
+        theta = np.pi / 3
+        want = [np.cos(theta), -np.cos(theta)]
+        got = evaluator.evaluate([theta])
+        for w, g in zip(want, got):
+            message = "SubspaceExpectationEvaluator not working for a PauliSum."
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_different_parameters(self):
+        other = qiskit.QuantumCircuit(2)
+        other.ry(Parameter("phi"), 0)
+        with self.assertRaises(ValueError):
+            SubspaceExpectationEvaluator(Z ^ Z, self.backend, [self.circuits[0], other])
+
+
+class TestHandObservables(unittest.TestCase):
+    def setUp(self):
+        # Simulator
+        self.backend = BasicAer.get_backend("qasm_simulator")
+
+        # Bell state
+        self.qc = qiskit.QuantumCircuit(2)
+        self.qc.h(0)
+        self.qc.cx(0, 1)
+
+    def test_bell(self):
+        want = [1.0, 0.0, 0.0, 1.0, -1.0]
+        got = measure_paulis(self.qc, ["ZZ", "ZI", "IZ", "XX", "YY"], self.backend)
+        decimalPlace = 1
+        for w, g in zip(want, got):
+            message = "Pauli measurement not working for the Bell state."
+            self.assertAlmostEqual(w, g, decimalPlace, message)
+
+
 if __name__ == "__main__":
     unittest.main(argv=[""], verbosity=2, exit=False)
@@ -0,0 +1,77 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from qiskit.opflow import I, X, Y, Z
+
+from volta.paulis import PauliSum
+from volta.hamiltonians import BCS_hamiltonian, create_epsilons, listop2op
+
+
+class TestPauliSum(unittest.TestCase):
+    def setUp(self):
+        self.op1 = 0.5 * (X ^ Y ^ I) - 1.5j * (Z ^ Z ^ Y)
+        self.op2 = 2.0 * (Y ^ X ^ Z) + (I ^ Z ^ X)
+        self.paulis1 = PauliSum.from_operator(self.op1)
+        self.paulis2 = PauliSum.from_operator(self.op2)
+
+    def test_labels(self):
+        want = ["XYI", "ZZY"]
+        got = self.paulis1.labels()
+        message = "Pauli labels not working."
+        self.assertEqual(want, got, message)
+
+    def test_add(self):
+        want = (self.op1 + self.op2).to_matrix()
+        got = (self.paulis1 + self.paulis2).to_matrix()
+        message = "Pauli sum addition not working."
+        self.assertTrue(np.allclose(want, got), message)
+
+    def test_compose(self):
+        want = (self.op1 @ self.op2).to_matrix()
+        got = (self.paulis1 * self.paulis2).to_matrix()
+        message = "Pauli sum multiplication not working."
+        self.assertTrue(np.allclose(want, got), message)
+
+    def test_tensor(self):
+        want = (self.op1 ^ self.op2).to_matrix()
+        got = (self.paulis1 ^ self.paulis2).to_matrix()
+        message = "Pauli sum tensor product not working."
+        self.assertTrue(np.allclose(want, got), message)
+
+    def test_simplify(self):
+        want = 0
+        got = (self.paulis1 - self.paulis1).simplify().num_terms
+        message = "Pauli sum simplification not working."
+        self.assertEqual(want, got, message)
+
+    def test_opflow_roundtrip(self):
+        want = self.op2.to_matrix()
+        got = PauliSum.from_operator(self.paulis2.to_opflow()).to_matrix()
+        message = "Conversion to and from opflow not working."
+        self.assertTrue(np.allclose(want, got), message)
+
+
+class TestBCSHamiltonian(unittest.TestCase):
+    def test_BCS(self):
+        epsilons = np.array([1.0, 2.0, 3.0])
+        V = 0.7
+        want = create_epsilons(epsilons / 2) + V * (
+            1 / 2 * (listop2op([X] * len(epsilons)))
+            + 1 / 2 * (listop2op([Y] * len(epsilons)))
+        )
+        got = BCS_hamiltonian(epsilons, V)
+        message = "BCS hamiltonian not matching the opflow construction."
+        self.assertTrue(np.allclose(want.to_matrix(), got.to_matrix()), message)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
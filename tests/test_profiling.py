@@ -0,0 +1,62 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import os
+import csv
+import json
+import tempfile
+import unittest
+
+from volta.profiling import Profiler, recording, timed, record_jobs
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.profiler = Profiler(callbacks=[self.received.append])
+
+        for cost in [1.0, 0.5]:
+            self.profiler.start()
+            with recording(self.profiler, "energy"):
+                with timed("execution"):
+                    record_jobs(2, 2000)
+            with recording(self.profiler, "overlap"):
+                record_jobs(1, 1000)
+            self.profiler.stop(cost=cost)
+
+    def test_records(self):
+        message = "Profiler not counting circuits and shots by part."
+        self.assertEqual(2, len(self.received), message)
+        self.assertEqual(2000, self.received[0]["energy_shots"], message)
+        self.assertEqual(1000, self.received[0]["overlap_shots"], message)
+        self.assertEqual(0.5, self.received[1]["cost"], message)
+        self.assertEqual(4, self.profiler.summary()["energy_circuits"], message)
+
+    def test_no_recording(self):
+        record_jobs(5, 5000)
+        with timed("execution"):
+            pass
+        self.assertEqual(4, self.profiler.summary()["energy_circuits"])
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, "profile.json")
+            csv_path = os.path.join(tmpdir, "profile.csv")
+            self.profiler.to_json(json_path)
+            self.profiler.to_csv(csv_path)
+
+            with open(json_path) as f:
+                self.assertEqual(2, len(json.load(f)))
+            with open(csv_path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual("1000", rows[1]["overlap_shots"])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
@@ -0,0 +1,70 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from qiskit.circuit.library import TwoLocal
+
+from volta.results import RunResult
+
+
+class TestRunResult(unittest.TestCase):
+    def setUp(self):
+        self.ansatz = TwoLocal(2, ["ry", "rz"], "cx", reps=1)
+        n_parameters = len(self.ansatz.parameters)
+
+        self.result = RunResult(3, n_parameters, capacity=2)
+        for state, energy in enumerate([-1.0, -2.0]):
+            for cost in [3.0, 2.0, 1.0]:
+                self.result.record(state, cost, energy, cost - energy)
+            self.result.add_state(state, np.full(n_parameters, state), energy)
+
+    def test_sorted_energies(self):
+        message = "Energies not sorted by value."
+        self.assertEqual([-2.0, -1.0], list(self.result.energies), message)
+        self.assertEqual([-1.0, -2.0], list(self.result.state_energies), message)
+        self.assertEqual(1.0, self.result.optimal_params[0, 0], message)
+
+    def test_traces(self):
+        message = "Traces not growing past the capacity."
+        self.assertEqual(6, len(self.result.trace()["cost"]), message)
+        self.assertEqual([3, 3, 0], list(self.result.n_evaluations), message)
+        self.assertEqual(3, len(self.result.trace(1)["penalty"]), message)
+
+    def test_record_after_run(self):
+        self.result.add_state(2, np.zeros(self.result.n_parameters), 0.0)
+        self.result.record(3, 1.0, 0.0, 1.0)
+
+        message = "Evaluations after the run not traced apart."
+        self.assertEqual([3, 3, 0], list(self.result.n_evaluations), message)
+        self.assertEqual(1, len(self.result.trace(3)["cost"]), message)
+
+    def test_states(self):
+        states = self.result.states(self.ansatz)
+        self.assertEqual(2, len(states))
+        self.assertEqual(0, len(states[0].parameters))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "result.npz")
+            self.result.save(path)
+            loaded = RunResult.load(path)
+
+        message = "Results not matching after saving and loading."
+        self.assertEqual(list(self.result.energies), list(loaded.energies), message)
+        self.assertEqual(
+            list(self.result.trace()["cost"]), list(loaded.trace()["cost"]), message
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
@@ -0,0 +1,58 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import qiskit
+
+from qiskit import BasicAer
+from qiskit.opflow import I, X, Z
+from qiskit.quantum_info import Statevector
+
+from volta.shadows import collect_shadow
+
+
+class TestClassicalShadow(unittest.TestCase):
+    def setUp(self):
+        self.backend = BasicAer.get_backend("qasm_simulator")
+
+        # |+1> state
+        self.qc = qiskit.QuantumCircuit(2)
+        self.qc.x(0)
+        self.qc.h(1)
+
+        self.shadow = collect_shadow(self.qc, self.backend, n_snapshots=3000, seed=42)
+
+    def test_num_snapshots(self):
+        want = 3000
+        got = self.shadow.num_snapshots
+        message = "Classical shadow does not have one snapshot per shot."
+        self.assertEqual(want, got, message)
+
+    def test_paulis(self):
+        want = [1.0, -1.0, 0.0]
+        got = self.shadow.estimate_paulis(["XI", "IZ", "ZI"])
+        message = "Classical shadow Pauli estimates not working for |+1>."
+        for w, g in zip(want, got):
+            self.assertLess(abs(w - g), 0.3, message)
+
+    def test_hamiltonian(self):
+        want = 0.5 - 1.0
+        got = self.shadow.estimate(0.5 * (X ^ I) + (I ^ Z))
+        message = "Classical shadow energy not working for |+1>."
+        self.assertLess(abs(want - got), 0.3, message)
+
+    def test_fidelity(self):
+        want = 1.0
+        got = self.shadow.estimate_fidelity(Statevector(self.qc).data)
+        message = "Classical shadow fidelity not working for |+1>."
+        self.assertLess(abs(want - got), 0.3, message)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
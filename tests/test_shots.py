@@ -0,0 +1,44 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from volta.shots import ShotAllocator
+
+
+class TestShotAllocator(unittest.TestCase):
+    def setUp(self):
+        self.allocator = ShotAllocator(1000, [1.0, 3.0, 0.0], min_shots=100)
+
+    def test_budget(self):
+        want = 1000
+        got = np.sum(self.allocator.allocate())
+        message = "Shot allocation does not add up to the budget."
+        self.assertEqual(want, got, message)
+
+    def test_proportional(self):
+        want = [275, 625, 100]
+        got = list(self.allocator.allocate())
+        message = "Shots are not proportional to the standard deviations."
+        self.assertEqual(want, got, message)
+
+    def test_update(self):
+        self.allocator.update([3.0, 1.0, 0.0])
+        shots = self.allocator.allocate()
+        message = "Shot allocation not updated with the standard deviations."
+        self.assertEqual(shots[0], shots[1], message)
+
+    def test_small_budget(self):
+        with self.assertRaises(ValueError):
+            ShotAllocator(2, [1.0, 1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
@@ -11,7 +11,7 @@ import unittest
 
 import qiskit
 from qiskit.circuit.library import TwoLocal
-from qiskit import QuantumCircuit, Aer
+from qiskit import Aer
 from qiskit.utils import QuantumInstance
 from qiskit.opflow import Z, I
 
@@ -58,6 +58,62 @@ class TestSSVQD(unittest.TestCase):
         message = "SSVQE not working for the first excited state of 1/2*((Z^I) + (Z^Z))"
         self.assertAlmostEqual(want, got, decimalPlace, message)
 
+    def test_energies_from_result(self):
+        for index, got in enumerate(self.energy):
+            want = self.Algo.result.state_energies[index]
+            message = f"SSVQE run({index}) does not reuse the subspace energy."
+            self.assertEqual(want, got, message)
+
+
+class TestSSVQEInitialization(unittest.TestCase):
+    def test_input_states(self):
+        backend = QuantumInstance(backend=Aer.get_backend("statevector_simulator"))
+        hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        ansatz = TwoLocal(hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        algo = SSVQE(
+            hamiltonian=hamiltonian,
+            ansatz=ansatz,
+            optimizer=qiskit.algorithms.optimizers.COBYLA(maxiter=1),
+            n_excited=4,
+            backend=backend,
+        )
+
+        circuits = algo._create_blank_circuit()
+        algo._apply_initialization(circuits)
+        for ind, circuit in enumerate(circuits):
+            want = [q for q, b in enumerate(format(ind, "02b")) if b == "1"]
+            got = [circuit.qubits.index(qargs[0]) for _, qargs, _ in circuit.data]
+            message = f"Input state {ind} not initialized as its binary string."
+            self.assertEqual(want, got, message)
+
+
+class TestSSVQEMultiStart(unittest.TestCase):
+    def _ssvqe(self, n_jobs):
+        backend = QuantumInstance(backend=Aer.get_backend("statevector_simulator"))
+        hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        ansatz = TwoLocal(hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        return SSVQE(
+            hamiltonian=hamiltonian,
+            ansatz=ansatz,
+            optimizer=qiskit.algorithms.optimizers.COBYLA(),
+            n_excited=2,
+            backend=backend,
+            n_starts=2,
+            n_jobs=n_jobs,
+            seed=42,
+        )
+
+    def test_pool(self):
+        serial = self._ssvqe(n_jobs=1)
+        pool = self._ssvqe(n_jobs=2)
+
+        decimalPlace = 6
+        message = "SSVQE starts in a pool of processes not matching the serial run."
+        for want, got in zip(serial.result.state_energies, pool.result.state_energies):
+            self.assertAlmostEqual(want, got, decimalPlace, message)
+
 
 if __name__ == "__main__":
     unittest.main(argv=[""], verbosity=2, exit=False)
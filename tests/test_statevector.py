@@ -0,0 +1,66 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import unittest
+import numpy as np
+
+from qiskit import BasicAer
+from qiskit.circuit.library import TwoLocal
+from qiskit.quantum_info import Statevector
+from qiskit.utils import QuantumInstance
+
+from volta.hamiltonians import BCS_hamiltonian
+from volta.observables import ExpectationEvaluator
+from volta.statevector import CompiledAnsatz, ExactExpectationEvaluator
+
+
+class TestCompiledAnsatz(unittest.TestCase):
+    def setUp(self):
+        self.ansatz = TwoLocal(3, ["ry", "rz"], "cx", reps=2)
+        self.parameters = sorted(self.ansatz.parameters, key=lambda p: p.name)
+        self.params = np.random.RandomState(42).rand(len(self.parameters))
+
+    def test_statevector(self):
+        qc = self.ansatz.assign_parameters(dict(zip(self.parameters, self.params)))
+        want = Statevector(qc).data
+        got = CompiledAnsatz(self.ansatz).statevector(self.params)
+        decimalPlace = 6
+        message = "Statevector simulation not working for TwoLocal."
+        self.assertAlmostEqual(1.0, np.abs(np.vdot(want, got)), decimalPlace, message)
+
+
+class TestExactExpectation(unittest.TestCase):
+    def setUp(self):
+        self.hamiltonian = BCS_hamiltonian([1.0, 2.0, 3.0], 0.5)
+        self.ansatz = TwoLocal(3, ["ry", "rz"], "cx", reps=1)
+        self.parameters = sorted(self.ansatz.parameters, key=lambda p: p.name)
+        self.params = np.random.RandomState(7).rand(len(self.parameters))
+
+        qc = self.ansatz.assign_parameters(dict(zip(self.parameters, self.params)))
+        psi = Statevector(qc).data
+        self.want = np.real(np.vdot(psi, self.hamiltonian.to_matrix() @ psi))
+
+    def test_expectation(self):
+        evaluator = ExactExpectationEvaluator(self.hamiltonian, self.ansatz)
+        got = evaluator.evaluate(self.params)
+        decimalPlace = 6
+        message = "Exact expectation not working for the BCS hamiltonian."
+        self.assertAlmostEqual(self.want, got, decimalPlace, message)
+
+    def test_statevector_backend(self):
+        backend = QuantumInstance(backend=BasicAer.get_backend("statevector_simulator"))
+        evaluator = ExpectationEvaluator(self.hamiltonian, backend, self.ansatz)
+        got = evaluator.evaluate(self.params)
+        decimalPlace = 6
+        message = "ExpectationEvaluator not using the exact statevector path."
+        self.assertAlmostEqual(self.want, got, decimalPlace, message)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[""], verbosity=2, exit=False)
@@ -8,12 +8,21 @@
 
 
 import unittest
+import numpy as np
 from qiskit import QuantumCircuit, BasicAer
+from qiskit.circuit import Parameter
 from qiskit.utils import QuantumInstance
 from volta.swaptest import (
     measure_swap_test,
     measure_dswap_test,
     measure_amplitude_transition_test,
+    measure_overlaps,
+    overlap_matrix,
+    OverlapTemplate,
+    measure_overlap_templates,
+    measure_overlap_sequential,
+    choose_overlap_method,
+    overlap_costs,
 )
 
 
@@ -133,5 +142,85 @@ class TestAmplitudeTransitionTest(unittest.TestCase):
         self.assertAlmostEqual(want, got, decimalPlace, message)
 
 
+class TestMeasureOverlaps(unittest.TestCase):
+    def setUp(self):
+        self.qc1 = QuantumCircuit(1)
+        self.qc1.x(0)
+        self.qc2 = QuantumCircuit(1)
+        self.backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"), shots=10000
+        )
+
+    def test_batch(self):
+        pairs = [(self.qc1, self.qc1), (self.qc1, self.qc2), (self.qc2, self.qc2)]
+        want = [1.0, 0.0, 1.0]
+        decimalPlace = 1
+        for method in ["swap", "dswap", "amplitude"]:
+            got = measure_overlaps(pairs, self.backend, method)
+            message = f"Batched overlaps not working for the {method} method."
+            for w, g in zip(want, got):
+                self.assertAlmostEqual(w, g, decimalPlace, message)
+
+    def test_overlap_matrix(self):
+        qc3 = QuantumCircuit(1)
+        qc3.h(0)
+        want = [[1.0, 0.0, 0.5], [0.0, 1.0, 0.5], [0.5, 0.5, 1.0]]
+        got = overlap_matrix([self.qc1, self.qc2, qc3], self.backend)
+        decimalPlace = 1
+        message = "Overlap matrix not working for states 1, 0 and +."
+        for i in range(3):
+            for j in range(3):
+                self.assertAlmostEqual(want[i][j], got[i][j], decimalPlace, message)
+
+    def test_overlap_templates(self):
+        theta = Parameter("theta")
+        ansatz = QuantumCircuit(1)
+        ansatz.ry(theta, 0)
+        templates = [
+            OverlapTemplate(ansatz, self.qc2, self.backend, method)
+            for method in ["swap", "dswap", "amplitude"]
+        ]
+        want = [[1.0] * 3, [0.5] * 3, [0.0] * 3]
+        got = measure_overlap_templates(
+            templates, [[0.0], [np.pi / 2], [np.pi]], self.backend
+        )
+        decimalPlace = 1
+        message = "Overlap templates not working for ry(theta) and state 0."
+        for i in range(3):
+            for j in range(3):
+                self.assertAlmostEqual(want[i][j], got[i][j], decimalPlace, message)
+
+    def test_sequential(self):
+        want = 0.0
+        got, half_width, shots_used = measure_overlap_sequential(
+            self.qc1, self.qc2, self.backend, tolerance=0.05, chunk_shots=500
+        )
+        decimalPlace = 1
+        message = "Sequential swap test not working for states 1 and 0."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+        self.assertLessEqual(half_width, 0.05)
+        self.assertLess(shots_used, 10000)
+
+    def test_choose_overlap_method(self):
+        method, costs = choose_overlap_method(self.qc1, self.backend)
+        want = "amplitude"
+        message = "Amplitude test should be the cheapest on a simulator."
+        self.assertEqual(want, method, message)
+        self.assertEqual(3, costs["swap"]["width"])
+        self.assertEqual(2, costs["dswap"]["width"])
+        self.assertEqual(1, costs["amplitude"]["width"])
+
+    def test_instance_shots(self):
+        backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"), shots=100
+        )
+        costs = overlap_costs(self.qc1, backend, num_shots=10000)
+        want = 0.1
+        got = costs["swap"]["std"]
+        decimalPlace = 7
+        message = "Overlap costs should use the shots of the quantum instance."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+
 if __name__ == "__main__":
     unittest.main(argv=[""], verbosity=2, exit=False)
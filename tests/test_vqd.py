@@ -7,8 +7,12 @@
 # that they have been altered from the originals.
 
 
+import os
+import asyncio
+import tempfile
 import unittest
 import qiskit
+import numpy as np
 
 
 from qiskit.circuit.library import TwoLocal
@@ -18,6 +22,7 @@ from qiskit.opflow import Z, I
 
 
 from volta.vqd import VQD
+from volta.profiling import Profiler
 from volta.utils import classical_solver
 
 
@@ -169,6 +174,271 @@ class TestVQDAmplitude(unittest.TestCase):
         )
 
 
+class TestVQDExact(unittest.TestCase):
+    def setUp(self):
+        optimizer = qiskit.algorithms.optimizers.COBYLA()
+        backend = QuantumInstance(
+            backend=BasicAer.get_backend("statevector_simulator"),
+        )
+
+        hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        ansatz = TwoLocal(hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        self.Algo = VQD(
+            hamiltonian=hamiltonian,
+            ansatz=ansatz,
+            n_excited_states=1,
+            beta=1.0,
+            optimizer=optimizer,
+            backend=backend,
+            overlap_method="exact",
+        )
+
+        self.Algo.run(verbose=0)
+        self.eigenvalues, _ = classical_solver(hamiltonian)
+
+    def test_energies_0(self):
+        decimal_place = 1
+        want = self.eigenvalues[0]
+        got = self.Algo.energies[0]
+
+        self.assertAlmostEqual(
+            want,
+            got,
+            decimal_place,
+            "VQD with exact overlaps not working for the ground state of 1/2*((Z^I) + (Z^Z))",
+        )
+
+    def test_energies_1(self):
+        decimal_place = 1
+        want = self.eigenvalues[1]
+        got = self.Algo.energies[1]
+
+        self.assertAlmostEqual(
+            want,
+            got,
+            decimal_place,
+            "VQD with exact overlaps not working for the first excited state of 1/2*((Z^I) + (Z^Z))",
+        )
+
+    def test_cost_after_run(self):
+        params = self.Algo.result.state_params[0]
+        want = self.Algo.energies[0] + self.Algo.BETA * np.sum(
+            np.abs(self.Algo._statevectors @ self.Algo._statevectors[0].conj()) ** 2
+        )
+        got = self.Algo.cost_function(params)
+
+        decimal_place = 6
+        message = "VQD cost function not working after the run."
+        self.assertAlmostEqual(want, got, decimal_place, message)
+
+
+class TestVQDMultiStart(unittest.TestCase):
+    def setUp(self):
+        self.hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+
+        self.Algo = self._vqd(n_jobs=1)
+        self.Algo.run(verbose=0)
+        self.eigenvalues, _ = classical_solver(self.hamiltonian)
+
+    def _vqd(self, n_jobs):
+        optimizer = qiskit.algorithms.optimizers.COBYLA()
+        backend = QuantumInstance(
+            backend=BasicAer.get_backend("statevector_simulator"),
+        )
+        ansatz = TwoLocal(self.hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        return VQD(
+            hamiltonian=self.hamiltonian,
+            ansatz=ansatz,
+            n_excited_states=1,
+            beta=1.0,
+            optimizer=optimizer,
+            backend=backend,
+            overlap_method="exact",
+            n_starts=3,
+            n_jobs=n_jobs,
+            seed=42,
+        )
+
+    def test_pool(self):
+        pool = self._vqd(n_jobs=2)
+        pool.run(verbose=0)
+
+        decimal_place = 6
+        message = "VQD starts in a pool of processes not matching the serial run."
+        for want, got in zip(self.Algo.energies, pool.energies):
+            self.assertAlmostEqual(want, got, decimal_place, message)
+
+    def test_best_start(self):
+        for statistics, energy in zip(
+            self.Algo.multistart_statistics, self.Algo.energies
+        ):
+            self.assertEqual(3, len(statistics["values"]))
+            self.assertEqual(min(statistics["values"]), energy)
+
+    def test_energies_1(self):
+        decimal_place = 1
+        want = self.eigenvalues[1]
+        got = self.Algo.energies[1]
+
+        self.assertAlmostEqual(
+            want,
+            got,
+            decimal_place,
+            "VQD with multiple starts not working for the first excited state of 1/2*((Z^I) + (Z^Z))",
+        )
+
+
+class TestVQDCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.backend = QuantumInstance(
+            backend=BasicAer.get_backend("statevector_simulator"),
+        )
+        self.hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        self.ansatz = TwoLocal(self.hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "vqd.npz")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _vqd(self, n_excited_states):
+        return VQD(
+            hamiltonian=self.hamiltonian,
+            ansatz=self.ansatz,
+            n_excited_states=n_excited_states,
+            beta=1.0,
+            optimizer=qiskit.algorithms.optimizers.COBYLA(),
+            backend=self.backend,
+            overlap_method="exact",
+            seed=42,
+            checkpoint_path=self.path,
+        )
+
+    def test_resume(self):
+        first = self._vqd(0)
+        first.run(verbose=0)
+
+        resumed = self._vqd(1)
+        resumed.resume(self.path, verbose=0)
+
+        self.assertEqual(2, len(resumed.energies))
+        self.assertEqual(first.energies[0], resumed.energies[0])
+
+        eigenvalues, _ = classical_solver(self.hamiltonian)
+        self.assertAlmostEqual(
+            eigenvalues[1],
+            resumed.energies[1],
+            1,
+            "Resumed VQD not working for the first excited state of 1/2*((Z^I) + (Z^Z))",
+        )
+
+    def test_resume_too_many_states(self):
+        first = self._vqd(1)
+        first.run(verbose=0)
+
+        with self.assertRaises(ValueError):
+            self._vqd(0).resume(self.path, verbose=0)
+
+
+class TestVQDConcurrent(unittest.TestCase):
+    def setUp(self):
+        optimizer = qiskit.algorithms.optimizers.COBYLA()
+        backend = QuantumInstance(
+            backend=BasicAer.get_backend("statevector_simulator"),
+        )
+
+        hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        ansatz = TwoLocal(hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        self.Algo = VQD(
+            hamiltonian=hamiltonian,
+            ansatz=ansatz,
+            n_excited_states=0,
+            beta=1.0,
+            optimizer=optimizer,
+            backend=backend,
+            overlap_method="exact",
+            concurrent_jobs=True,
+        )
+        self.Algo.run(verbose=0)
+        self.params = np.random.RandomState(1).rand(self.Algo.n_parameters)
+
+    def test_async_cost(self):
+        want = self.Algo.cost_function(self.params)
+
+        loop = asyncio.new_event_loop()
+        try:
+            got = loop.run_until_complete(self.Algo.cost_function_async(self.params))
+        finally:
+            loop.close()
+
+        decimalPlace = 6
+        message = "Async cost function not matching the cost function."
+        self.assertAlmostEqual(want, got, decimalPlace, message)
+
+    def test_profiler(self):
+        profiler = Profiler()
+        self.Algo.profiler = profiler
+        self.Algo.cost_function(self.params)
+
+        record = profiler.records[-1]
+        message = "Profiler not recording the cost evaluation."
+        self.assertEqual("cost", record["kind"], message)
+        self.assertGreater(record["energy_execution_time"], 0.0, message)
+        self.assertGreater(record["overlap_post_processing_time"], 0.0, message)
+
+
+class TestVQDConcurrentQasm(unittest.TestCase):
+    def setUp(self):
+        optimizer = qiskit.algorithms.optimizers.COBYLA()
+        backend = QuantumInstance(
+            backend=BasicAer.get_backend("qasm_simulator"),
+            shots=10000,
+            seed_simulator=42,
+            seed_transpiler=42,
+        )
+
+        hamiltonian = 1 / 2 * (Z ^ I) + 1 / 2 * (Z ^ Z)
+        ansatz = TwoLocal(hamiltonian.num_qubits, ["ry", "rz"], "cx", reps=1)
+
+        self.Algo = VQD(
+            hamiltonian=hamiltonian,
+            ansatz=ansatz,
+            n_excited_states=1,
+            beta=1.0,
+            optimizer=optimizer,
+            backend=backend,
+            overlap_method="swap",
+            concurrent_jobs=True,
+            profiler=Profiler(),
+        )
+
+        # The overlap branch needs a previous state
+        rng = np.random.RandomState(1)
+        self.Algo._add_state(rng.rand(self.Algo.n_parameters), 0.0)
+        self.params = rng.rand(self.Algo.n_parameters)
+
+    def test_concurrent_submissions(self):
+        got = [self.Algo.cost_function(self.params) for _ in range(3)]
+
+        record = self.Algo.profiler.records[-1]
+        message = "Both branches should submit jobs to the backend."
+        self.assertGreater(record["energy_execution_time"], 0.0, message)
+        self.assertGreater(record["energy_circuits"], 0, message)
+        self.assertEqual(10000 * record["energy_circuits"], record["energy_shots"])
+        self.assertGreater(record["overlap_circuits"], 0, message)
+
+        self.Algo.concurrent_jobs = False
+        want = self.Algo.cost_function(self.params)
+
+        decimalPlace = 1
+        message = "Concurrent cost function not matching the sequential one on qasm."
+        for g in got:
+            self.assertAlmostEqual(want, g, decimalPlace, message)
+
+
 class VQDRaiseError(unittest.TestCase):
     def test_not_implemented_overlapping_method(self):
         optimizer = qiskit.algorithms.optimizers.COBYLA()
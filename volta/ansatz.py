@@ -11,6 +11,112 @@ from qiskit.circuit.library import TwoLocal
 from qiskit import QuantumCircuit
 import numpy as np
 
+from functools import lru_cache
+from typing import Union
+
+from volta.profiling import timed
+
+
+class ParameterBinder(object):
+    """Binds parameter values to a parametrized circuit.
+
+    The parameters are ordered by name once, as in the variational forms, so
+    each binding only validates the length of the values and assigns them.
+    Circuits built from the ansatz, such as measurement or transpiled
+    circuits, can be bound with the same ordering.
+    """
+
+    def __init__(self, ansatz: QuantumCircuit) -> None:
+        """Initialize the class.
+
+        Args:
+            ansatz (QuantumCircuit): Parametrized quantum circuit.
+        """
+        self.ansatz = ansatz
+
+        # Parameters are ordered by name, as in the variational forms
+        self.parameters = sorted(ansatz.parameters, key=lambda p: p.name)
+
+    @property
+    def num_parameters(self) -> int:
+        """Returns the number of free parameters of the ansatz.
+
+        Returns:
+            int: Number of parameters.
+        """
+        return len(self.parameters)
+
+    def parameter_dict(self, params: Union[list, np.array]) -> dict:
+        """Returns the dictionary from each parameter to its value.
+
+        Args:
+            params (Union[list, np.array]): Parameter values.
+
+        Returns:
+            dict: Parameter values.
+        """
+        # Check if the number of parameters is compatible
+        assert len(self.parameters) == len(
+            params
+        ), "The number of parameters don't match"
+
+        return dict(zip(self.parameters, params))
+
+    def parameter_lists(self, params_batch: np.array) -> dict:
+        """Returns the dictionary from each parameter to its values for many
+        parameter vectors.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+
+        Returns:
+            dict: List of values of each parameter.
+        """
+        params_batch = np.atleast_2d(np.asarray(params_batch, dtype=float))
+
+        # Check if the number of parameters is compatible
+        assert params_batch.shape[1] == len(
+            self.parameters
+        ), "The number of parameters don't match"
+
+        return {
+            param: params_batch[:, i].tolist()
+            for i, param in enumerate(self.parameters)
+        }
+
+    def bind(
+        self, params: Union[list, np.array], circuit: QuantumCircuit = None
+    ) -> QuantumCircuit:
+        """Binds the parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values.
+            circuit (QuantumCircuit, optional): Circuit with the parameters of the ansatz.
+            Defaults to the ansatz.
+
+        Returns:
+            QuantumCircuit: Circuit with parameters applied.
+        """
+        if circuit is None:
+            circuit = self.ansatz
+        with timed("binding"):
+            return circuit.assign_parameters(self.parameter_dict(params))
+
+    def bind_batch(
+        self, params_batch: np.array, circuit: QuantumCircuit = None
+    ) -> list:
+        """Binds many parameter vectors.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+            circuit (QuantumCircuit, optional): Circuit with the parameters of the ansatz.
+            Defaults to the ansatz.
+
+        Returns:
+            list: Circuits with parameters applied.
+        """
+        return [self.bind(params, circuit) for params in params_batch]
+
 
 def _get_ansatz(n_qubits: int, reps: int = 1) -> QuantumCircuit:
     """Create a TwoLocal ansatz for `n_qubits`.
@@ -34,7 +140,13 @@ def get_num_parameters(n_qubits: int) -> int:
     Returns:
         int: number of parameters
     """
-    return len(_get_ansatz(n_qubits).parameters)
+    return _get_binder(n_qubits, 1).num_parameters
+
+
+@lru_cache(maxsize=None)
+def _get_binder(n_qubits: int, reps: int) -> ParameterBinder:
+    """TwoLocal binder for `n_qubits`, built once for each size."""
+    return ParameterBinder(_get_ansatz(n_qubits, reps))
 
 
 def get_var_form(params: np.array, n_qubits: int = 2, reps: int = 1) -> QuantumCircuit:
@@ -49,20 +161,4 @@ def get_var_form(params: np.array, n_qubits: int = 2, reps: int = 1) -> QuantumC
     Returns:
         QuantumCircuit: Circuit with parameters applied
     """
-
-    # Define variational Form
-    var_form = _get_ansatz(n_qubits, reps)
-
-    # Get Parameters from the variational form
-    var_form_params = sorted(var_form.parameters, key=lambda p: p.name)
-
-    # Check if the number of parameters is compatible
-    assert len(var_form_params) == len(params), "The number of parameters don't match"
-
-    # Create a dictionary with the parameters and values
-    param_dict = dict(zip(var_form_params, params))
-
-    # Assing those values for the ansatz
-    wave_function = var_form.assign_parameters(param_dict)
-
-    return wave_function
+    return _get_binder(n_qubits, reps).bind(params)
@@ -0,0 +1,109 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from collections import OrderedDict
+from typing import Union, Callable
+
+
+class CostCache(object):
+    """Least recently used cache of cost function values keyed on parameter
+    vectors quantized to a tolerance.
+
+    In the reuse mode a cached point returns the stored value without calling
+    the function. In the resample mode, meant for shot-based backends, the
+    function is evaluated again and the cache returns the running mean of
+    every sample of that point.
+    """
+
+    def __init__(
+        self, tolerance: float = 1e-8, maxsize: int = 1024, mode: str = "reuse"
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            tolerance (float, optional): Size of the quantization of the parameters,
+            points closer than that share the same entry. Defaults to 1e-8.
+            maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+            mode (str, optional): Cache mode. Modes available: reuse, resample.
+            Defaults to reuse.
+        """
+        IMPLEMENTED_MODES = ["reuse", "resample"]
+        if mode not in IMPLEMENTED_MODES:
+            raise NotImplementedError(
+                f"cache mode not implemented. Available implementing modes: {IMPLEMENTED_MODES}"
+            )
+
+        self.tolerance = tolerance
+        self.maxsize = maxsize
+        self.mode = mode
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, params: Union[list, np.array]) -> tuple:
+        """Quantized parameters."""
+        quantized = np.round(np.asarray(params, dtype=float) / self.tolerance)
+        return tuple(quantized.astype(np.int64))
+
+    def get_or_evaluate(
+        self, function: Callable, params: Union[list, np.array]
+    ) -> float:
+        """Returns the cached value of the parameters or evaluates the function.
+
+        Args:
+            function (Callable): Cost function.
+            params (Union[list, np.array]): Parameter values.
+
+        Returns:
+            float: Cost function value.
+        """
+        key = self._key(params)
+
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if self.mode == "reuse":
+                total, n_samples = self._entries[key]
+                return total / n_samples
+        else:
+            self.misses += 1
+
+        total, n_samples = self._entries.get(key, (0.0, 0))
+        total, n_samples = total + function(params), n_samples + 1
+        self._entries[key] = (total, n_samples)
+
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return total / n_samples
+
+    def clear(self) -> None:
+        """Removes all the entries, keeping the statistics."""
+        self._entries.clear()
+
+    @property
+    def statistics(self) -> dict:
+        """Returns the hit and miss statistics.
+
+        Returns:
+            dict: Number of hits, misses, hit rate and entries.
+        """
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls > 0 else 0.0,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,174 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+# Number of set bits of each byte
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+# Bits 0, 2, 4, ... set
+_EVEN_BITS = int("01" * 32, 2)
+
+
+def counts_to_arrays(count: dict) -> (np.array, np.array):
+    """Converts measurement counts to integer outcomes and weights, the bit i
+    of an outcome is the classical bit i. Registers up to 63 bits are supported.
+
+    Args:
+        count (dict): Counts from a qiskit result.
+
+    Returns:
+        np.array: Integer outcomes.
+        np.array: Number of shots of each outcome.
+    """
+    outcomes = np.array([int(k.replace(" ", ""), 2) for k in count], dtype=np.int64)
+    weights = np.array(list(count.values()), dtype=float)
+    return outcomes, weights
+
+
+def popcount(values: np.array) -> np.array:
+    """Number of set bits of each integer.
+
+    Args:
+        values (np.array): Integers.
+
+    Returns:
+        np.array: Number of set bits.
+    """
+    values = np.ascontiguousarray(values, dtype=np.int64)
+    return _BYTE_POPCOUNT[values.view(np.uint8)].reshape(values.shape + (8,)).sum(-1)
+
+
+def parity(values: np.array) -> np.array:
+    """Parity of the number of set bits of each integer.
+
+    Args:
+        values (np.array): Integers.
+
+    Returns:
+        np.array: 0 for even and 1 for odd number of set bits.
+    """
+    values = np.array(values, dtype=np.int64)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        values ^= values >> shift
+    return values & 1
+
+
+def parity_expectations(
+    outcomes: np.array, weights: np.array, masks: np.array
+) -> np.array:
+    """Expected values of Z strings given by bit masks.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        weights (np.array): Weight of each outcome.
+        masks (np.array): Bit mask of each Z string.
+
+    Returns:
+        np.array: Expected value of each Z string.
+    """
+    signs = 1 - 2 * parity(outcomes[None, :] & np.asarray(masks)[:, None])
+    return signs @ weights / weights.sum()
+
+
+def marginal(outcomes: np.array, weights: np.array, bits: list) -> (np.array, np.array):
+    """Marginal distribution over some of the bits, the bit bits[i] of the
+    outcomes becomes the bit i of the marginal outcomes.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        weights (np.array): Weight of each outcome.
+        bits (list): Bits that are kept.
+
+    Returns:
+        np.array: Marginal outcomes.
+        np.array: Weight of each marginal outcome.
+    """
+    reduced = np.zeros_like(outcomes)
+    for i, bit in enumerate(bits):
+        reduced |= ((outcomes >> bit) & 1) << i
+
+    marginal_outcomes, inverse = np.unique(reduced, return_inverse=True)
+    marginal_weights = np.bincount(inverse.reshape(-1), weights=weights)
+    return marginal_outcomes, marginal_weights
+
+
+def swap_test_fidelity(outcomes: np.array, weights: np.array) -> float:
+    """Fidelity from the outcomes of the auxiliary qubit of a SWAP test.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        weights (np.array): Weight of each outcome.
+
+    Returns:
+        float: Fidelity.
+    """
+    p_0 = weights[(outcomes & 1) == 0].sum() / weights.sum()
+    return 2 * (p_0 - 1 / 2)
+
+
+def dswap_test_fidelity(outcomes: np.array, weights: np.array, n_qubits: int) -> float:
+    """Fidelity from the outcomes of a destructive SWAP test, where the qubit i
+    of each state is measured on the classical bits 2i and 2i + 1.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        weights (np.array): Weight of each outcome.
+        n_qubits (int): Number of qubits of each state.
+
+    Returns:
+        float: Fidelity.
+    """
+    return dswap_test_values(outcomes, n_qubits) @ weights / weights.sum()
+
+
+def dswap_test_values(outcomes: np.array, n_qubits: int) -> np.array:
+    """Single shot fidelity estimate of each outcome of a destructive SWAP test.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        n_qubits (int): Number of qubits of each state.
+
+    Returns:
+        np.array: Fidelity estimate of each outcome.
+    """
+    # Pairs of bits where both qubits are measured as 1
+    n_11 = popcount(outcomes & (outcomes >> 1) & _EVEN_BITS)
+    return (n_qubits - 2 * n_11) / n_qubits
+
+
+def amplitude_transition_fidelity(outcomes: np.array, weights: np.array) -> float:
+    """Fidelity from the outcomes of an amplitude transition test.
+
+    Args:
+        outcomes (np.array): Integer outcomes.
+        weights (np.array): Weight of each outcome.
+
+    Returns:
+        float: Fidelity.
+    """
+    return weights[outcomes == 0].sum() / weights.sum()
+
+
+def wilson_half_width(p: float, n_shots: float, z: float) -> float:
+    """Half width of the Wilson score interval of a probability.
+
+    Args:
+        p (float): Estimated probability.
+        n_shots (float): Number of shots.
+        z (float): Quantile of the standard normal for the confidence level.
+
+    Returns:
+        float: Half width of the interval.
+    """
+    return (
+        z
+        / (1 + z**2 / n_shots)
+        * np.sqrt(p * (1 - p) / n_shots + z**2 / (4 * n_shots**2))
+    )
@@ -0,0 +1,98 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from typing import Union
+
+from qiskit import QuantumCircuit
+
+from volta.statevector import CompiledAnsatz
+
+# Gates of the form exp(-i theta P / 2), up to a global phase, with P a Pauli
+# string, where the two-term parameter-shift rule is exact.
+SHIFT_RULE_GATES = ["rx", "ry", "rz", "p", "u1", "u2", "u3", "u", "rzz"]
+
+
+class ParameterShiftGradient(object):
+    """Analytic gradients with the parameter-shift rule.
+
+    The derivative of the expected value f of any observable with respect to
+    a parameter that enters a single rotation gate is
+    (f(theta + pi/2 e_i) - f(theta - pi/2 e_i)) / 2, so the gradient only needs
+    the 2 * n_params shifted parameter vectors, which can be evaluated together
+    in a batch.
+    """
+
+    def __init__(self, ansatz: QuantumCircuit) -> None:
+        """Initialize the class.
+
+        Args:
+            ansatz (QuantumCircuit): Parametrized quantum circuit.
+
+        Raises:
+            ValueError: If a parameter is not used by exactly one rotation gate.
+        """
+        self.ansatz = ansatz
+
+        try:
+            compiled = CompiledAnsatz(ansatz)
+        except NotImplementedError as error:
+            raise ValueError(
+                f"Ansatz not supported by the parameter-shift rule: {error}"
+            )
+
+        uses = np.zeros(compiled.num_parameters, dtype=int)
+        for name, angles in compiled.parametrized_gates:
+            for angle in angles:
+                if isinstance(angle, float):
+                    continue
+                if name not in SHIFT_RULE_GATES or not isinstance(angle, int):
+                    raise ValueError(
+                        f"Gate {name} is not supported by the parameter-shift rule, "
+                        "each parameter must be the angle of a rotation gate."
+                    )
+                uses[angle] += 1
+
+        if np.any(uses != 1):
+            raise ValueError(
+                "Each parameter must be used by exactly one gate for the parameter-shift rule."
+            )
+
+        self.n_parameters = compiled.num_parameters
+
+    def shifted_parameters(self, params: Union[list, np.array]) -> np.array:
+        """Returns the shifted parameter vectors needed for the gradient.
+
+        Args:
+            params (Union[list, np.array]): Parameter values.
+
+        Returns:
+            np.array: Parameters with shape (2 * n_params, n_params), the first half
+            shifted by +pi/2 and the second half by -pi/2.
+        """
+        params = np.asarray(params, dtype=float)
+
+        # Check if the number of parameters is compatible
+        assert len(params) == self.n_parameters, "The number of parameters don't match"
+
+        shifts = np.pi / 2 * np.eye(self.n_parameters)
+        return np.vstack([params + shifts, params - shifts])
+
+    def gradient_from_values(self, values: np.array) -> np.array:
+        """Returns the gradient from the values at the shifted parameters.
+
+        Args:
+            values (np.array): Values at the output of shifted_parameters.
+
+        Returns:
+            np.array: Gradient.
+        """
+        values = np.asarray(values, dtype=float)
+        return (values[: self.n_parameters] - values[self.n_parameters :]) / 2
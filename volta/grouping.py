@@ -0,0 +1,293 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from typing import Union
+
+from qiskit import QuantumCircuit
+from qiskit.opflow import OperatorBase
+from qiskit.utils import QuantumInstance
+from qiskit.providers import BaseBackend
+
+from volta.ansatz import ParameterBinder
+from volta.profiling import timed
+from volta.utils import get_counts
+from volta.counts import counts_to_arrays, parity
+from volta.shots import ShotAllocator
+from volta.paulis import PauliSum
+
+# Pauli codes used on the basis arrays
+_PAULI_CODES = {"I": 0, "X": 1, "Y": 2, "Z": 3}
+
+
+def group_qubitwise_commuting(labels: list) -> list:
+    """Split Pauli labels in groups where all the terms commute qubit-wise.
+
+    Args:
+        labels (list): Pauli labels.
+
+    Returns:
+        list: List of groups, each one is a list with the indices of the labels.
+    """
+    if len(labels) == 0:
+        return []
+
+    codes = np.array(
+        [[_PAULI_CODES[p] for p in label] for label in labels], dtype=np.int8
+    ).reshape(len(labels), -1)
+
+    groups, bases = [], []
+    for index, code in enumerate(codes):
+        for group, basis in zip(groups, bases):
+            if np.all((basis == 0) | (code == 0) | (basis == code)):
+                group.append(index)
+                np.maximum(basis, code, out=basis)
+                break
+        else:
+            groups.append([index])
+            bases.append(code.copy())
+
+    return groups
+
+
+def group_basis(labels: list) -> str:
+    """Measurement basis shared by a group of qubit-wise commuting labels.
+
+    Args:
+        labels (list): Qubit-wise commuting Pauli labels.
+
+    Returns:
+        str: Pauli label of the basis, identity where no term acts.
+    """
+    basis = ["I"] * len(labels[0])
+    for label in labels:
+        for qubit, pauli in enumerate(label):
+            if pauli != "I":
+                basis[qubit] = pauli
+    return "".join(basis)
+
+
+def measurement_circuit(ansatz: QuantumCircuit, basis: str) -> QuantumCircuit:
+    """Construct the circuit that measures the ansatz on a Pauli basis.
+
+    Args:
+        ansatz (QuantumCircuit): Quantum circuit for the state.
+        basis (str): Pauli label of the measurement basis.
+
+    Returns:
+        QuantumCircuit: Circuit with the basis rotation and measurements.
+    """
+    n_qubits = ansatz.num_qubits
+    meas_circuit = QuantumCircuit(n_qubits)
+    meas_circuit.append(ansatz, range(n_qubits))
+
+    # The first character of the label acts on the last qubit
+    for qubit, pauli in enumerate(reversed(basis)):
+        if pauli == "X":
+            meas_circuit.h(qubit)
+        elif pauli == "Y":
+            meas_circuit.sdg(qubit)
+            meas_circuit.h(qubit)
+
+    meas_circuit.measure_all()
+    return meas_circuit
+
+
+def _group_statistics(count: dict, masks: np.array, coeffs: np.array) -> (float, float):
+    """Mean and standard deviation of a group of Pauli terms, given by bit masks
+    and coefficients, from measurement counts."""
+    outcomes, weights = counts_to_arrays(count)
+    weights /= weights.sum()
+
+    # Value of the group observable for each outcome
+    signs = 1 - 2 * parity(outcomes[None, :] & masks[:, None])
+    values = np.real(coeffs @ signs)
+
+    mean = values @ weights
+    return mean, np.sqrt(np.maximum((values - mean) ** 2 @ weights, 0.0))
+
+
+class GroupedExpectationEvaluator(object):
+    """Evaluates the expected value of a hamiltonian on shot-based backends
+    measuring groups of qubit-wise commuting Pauli terms.
+
+    Each group is measured with one basis-rotated circuit and every term of
+    the group is computed from the same counts, so the number of circuits
+    grows with the number of groups instead of the number of terms. If a shot
+    budget is given, it is spread across the groups in proportion to their
+    estimated standard deviation, updated after every evaluation.
+    """
+
+    def __init__(
+        self,
+        hamiltonian: Union[OperatorBase, PauliSum],
+        backend: Union[BaseBackend, QuantumInstance],
+        ansatz: QuantumCircuit,
+        num_shots: int = 10000,
+        shot_budget: int = None,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            hamiltonian (Union[OperatorBase, PauliSum]): Hamiltonian made of Pauli operators.
+            backend (Union[BaseBackend, QuantumInstance]): Backend for running the circuits.
+            ansatz (QuantumCircuit): Parametrized quantum circuit for the state.
+            num_shots (int, optional): Number of shots for each group. Defaults to 10000.
+            shot_budget (int, optional): Total number of shots for each evaluation,
+            allocated across the groups by variance. Defaults to None.
+        """
+        self.hamiltonian = hamiltonian
+        self.backend = backend
+        self.ansatz = ansatz
+        self.num_shots = num_shots
+
+        self._binder = ParameterBinder(ansatz)
+
+        paulis = PauliSum.from_operator(hamiltonian).simplify()
+        labels, coeffs = paulis.labels(), paulis.coeffs
+        masks = paulis.x_masks() | paulis.z_masks()
+
+        # Identity terms do not need to be measured
+        self._offset = np.real(np.sum(coeffs[masks == 0]))
+        terms = np.flatnonzero(masks != 0)
+
+        self.groups = [
+            terms[group]
+            for group in group_qubitwise_commuting([labels[t] for t in terms])
+        ]
+        self._masks = [masks[group] for group in self.groups]
+        self._coeffs = [coeffs[group] for group in self.groups]
+
+        self._circuits = [
+            measurement_circuit(ansatz, group_basis([labels[t] for t in group]))
+            for group in self.groups
+        ]
+
+        # The standard deviation of a group is bounded by the sum of |coefficient|
+        self.shot_allocator = None
+        if shot_budget is not None and self.num_groups > 0:
+            self.shot_allocator = ShotAllocator(
+                shot_budget, [np.sum(np.abs(coeffs)) for coeffs in self._coeffs]
+            )
+
+    @property
+    def num_groups(self) -> int:
+        """Returns the number of measurement groups.
+
+        Returns:
+            int: Number of groups.
+        """
+        return len(self.groups)
+
+    def _bind(self, params: Union[list, np.array]) -> list:
+        """Binds the parameters to every measurement circuit."""
+        param_dict = self._binder.parameter_dict(params)
+        with timed("binding"):
+            return [circuit.assign_parameters(param_dict) for circuit in self._circuits]
+
+    def _num_shots(self) -> Union[int, np.array]:
+        """Number of shots for each group."""
+        if self.shot_allocator is None:
+            return self.num_shots
+        return self.shot_allocator.allocate()
+
+    def _energy(self, counts: list) -> (float, np.array):
+        """Gets the energy and the standard deviation of each group from the
+        counts of each group."""
+        with timed("post_processing"):
+            statistics = np.array(
+                [
+                    _group_statistics(count, masks, coeffs)
+                    for count, masks, coeffs in zip(counts, self._masks, self._coeffs)
+                ]
+            )
+        return self._offset + np.sum(statistics[:, 0]), statistics[:, 1]
+
+    def evaluate(self, params: Union[list, np.array]) -> float:
+        """Evaluates the expected value for the given parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the ansatz.
+
+        Returns:
+            float: Expected value
+        """
+        if self.num_groups == 0:
+            return self._offset
+
+        counts = get_counts(self._bind(params), self.backend, self._num_shots())
+        energy, stds = self._energy(counts)
+
+        if self.shot_allocator is not None:
+            self.shot_allocator.update(stds)
+
+        return energy
+
+    def evaluate_batch(self, params_batch: np.array) -> np.array:
+        """Evaluates the expected value for many parameter vectors, all the
+        circuits are sent to the backend in a single submission.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+
+        Returns:
+            np.array: Expected values with shape (B,).
+        """
+        params_batch = np.atleast_2d(np.asarray(params_batch, dtype=float))
+        if self.num_groups == 0:
+            return np.full(len(params_batch), self._offset)
+
+        circuits = []
+        for params in params_batch:
+            circuits += self._bind(params)
+
+        num_shots = self._num_shots()
+        if np.ndim(num_shots) != 0:
+            num_shots = np.tile(num_shots, len(params_batch))
+
+        counts = get_counts(circuits, self.backend, num_shots)
+        energies, stds = zip(
+            *[
+                self._energy(counts[i : i + self.num_groups])
+                for i in range(0, len(counts), self.num_groups)
+            ]
+        )
+
+        if self.shot_allocator is not None:
+            self.shot_allocator.update(np.mean(stds, axis=0))
+
+        return np.array(energies)
+
+    def __call__(self, params: Union[list, np.array]) -> float:
+        return self.evaluate(params)
+
+
+def sample_hamiltonian_grouped(
+    hamiltonian: Union[OperatorBase, PauliSum],
+    backend: Union[BaseBackend, QuantumInstance],
+    ansatz: QuantumCircuit,
+    num_shots: int = 10000,
+) -> float:
+    """Samples a hamiltonian measuring qubit-wise commuting groups of Pauli
+    terms with shared counts.
+
+    Args:
+        hamiltonian (Union[OperatorBase, PauliSum]): Hamiltonian made of Pauli operators.
+        backend (Union[BaseBackend, QuantumInstance]): Backend that you want to run.
+        ansatz (QuantumCircuit): Quantum circuit that you want to get the expectation
+        value.
+        num_shots (int, optional): Number of shots for each group. Defaults to 10000.
+
+    Returns:
+        float: Expected value
+    """
+    return GroupedExpectationEvaluator(
+        hamiltonian, backend, ansatz, num_shots
+    ).evaluate([])
@@ -11,9 +11,12 @@ import numpy as np
 
 from typing import Union
 
-from qiskit.opflow import I, X, Y, Z
+from qiskit.opflow import I, Z
 from qiskit.opflow.list_ops.summed_op import SummedOp
 from qiskit.opflow.primitive_ops.pauli_op import PauliOp
+from qiskit.opflow.primitive_ops.pauli_sum_op import PauliSumOp
+
+from volta.paulis import PauliSum
 
 
 def listop2op(listop: list, coef: float = 1) -> PauliOp:
@@ -53,7 +56,31 @@ def create_epsilons(epsilons: list) -> SummedOp:
     return op
 
 
-def BCS_hamiltonian(epsilons: Union[list, np.array], V: float) -> SummedOp:
+def BCS_pauli_sum(epsilons: Union[list, np.array], V: float) -> PauliSum:
+    """Creates the BCS Hamiltonian given epsilons and V as a Pauli sum.
+
+    Args:
+        epsilons (Union[list,np.array]): Epsilons for the BCS hamiltonian.
+        V (float): V for the BCS Hamiltonian.
+
+    Returns:
+        PauliSum: BCS Hamiltonian.
+    """
+    epsilons = np.asarray(epsilons, dtype=float)
+    n_qubits = len(epsilons)
+
+    # The first epsilon acts on the last qubit
+    z_epsilons = np.eye(n_qubits, dtype=bool)[:, ::-1]
+    ones = np.ones((2, n_qubits), dtype=bool)
+
+    x_bits = np.vstack([np.zeros((n_qubits, n_qubits), dtype=bool), ones])
+    z_bits = np.vstack([z_epsilons, [np.zeros(n_qubits, dtype=bool), ones[1]]])
+    coeffs = np.concatenate([epsilons / 2, [V / 2, V / 2]])
+
+    return PauliSum.from_bits(x_bits, z_bits, coeffs)
+
+
+def BCS_hamiltonian(epsilons: Union[list, np.array], V: float) -> PauliSumOp:
     """Creates the BCS Hamiltonian given epsilons and V.
 
     Args:
@@ -61,14 +88,6 @@ def BCS_hamiltonian(epsilons: Union[list, np.array], V: float) -> SummedOp:
         V (float): V for the BCS Hamiltonian.
 
     Returns:
-        SummedOp: BCS Hamiltonian.
+        PauliSumOp: BCS Hamiltonian.
     """
-    if type(epsilons) != type(np.array([])):
-        epsilons = np.array(epsilons)
-
-    hamiltonian = create_epsilons(epsilons / 2)
-    hamiltonian += V * (
-        1 / 2 * (listop2op([X] * len(epsilons)))
-        + 1 / 2 * (listop2op([Y] * len(epsilons)))
-    )
-    return hamiltonian
+    return BCS_pauli_sum(epsilons, V).to_opflow()
@@ -8,124 +8,85 @@
 
 
 import qiskit
+import numpy as np
 
-from qiskit import execute
+from typing import Union
+
+from qiskit.utils import QuantumInstance
+from qiskit.providers import BaseBackend
+
+from volta.grouping import (
+    group_qubitwise_commuting,
+    group_basis,
+    measurement_circuit,
+)
+from volta.counts import counts_to_arrays, parity_expectations
+from volta.paulis import PauliSum
+from volta.utils import get_counts
 
 # Observables made by hand, those observables are changed
 # for the more general function sample_hamiltonian
 
 
-def _measure_zz_circuit(qc: qiskit.QuantumCircuit) -> qiskit.QuantumCircuit:
-    """Construct the circuit to measure"""
-    zz_circuit = qc.copy()
-    zz_circuit.measure_all()
+def measure_paulis(
+    qc: qiskit.QuantumCircuit,
+    paulis: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    shots: int = 10000,
+) -> np.array:
+    """Measure the expectation values of n-qubit Pauli strings for a given circuit.
+
+    The Pauli strings are grouped by measurement basis, each basis circuit is
+    run once and every expectation value is computed from the shared counts.
+    All the basis circuits are sent to the backend in a single submission.
 
-    return zz_circuit
+    Args:
+        qc (qiskit.QuantumCircuit): Quantum circuit for the state.
+        paulis (list): Pauli labels, the first character acts on the last qubit.
+        backend (Union[BaseBackend, QuantumInstance]): Backend.
+        shots (int, optional): Number of shots for each basis. Defaults to 10000.
 
+    Returns:
+        np.array: Expectation value of each Pauli string.
+    """
+    pauli_sum = PauliSum.from_labels(paulis)
+    masks = pauli_sum.x_masks() | pauli_sum.z_masks()
 
-def _clear_counts(count: dict) -> dict:
+    groups = group_qubitwise_commuting(paulis)
+    circuits = [
+        measurement_circuit(qc, group_basis([paulis[i] for i in group]))
+        for group in groups
+    ]
 
-    if "00" not in count:
-        count["00"] = 0
-    if "01" not in count:
-        count["01"] = 0
-    if "10" not in count:
-        count["10"] = 0
-    if "11" not in count:
-        count["11"] = 0
+    counts = get_counts(circuits, backend, shots)
 
-    return count
+    expectations = np.zeros(len(paulis))
+    for group, count in zip(groups, counts):
+        outcomes, weights = counts_to_arrays(count)
+        expectations[group] = parity_expectations(outcomes, weights, masks[group])
+    return expectations
 
 
 def measure_zz(qc, backend, shots=10000):
     """Measure the ZZ expectation value for a given circuit."""
-    zz_circuit = _measure_zz_circuit(qc)
-
-    count = execute(zz_circuit, backend=backend, shots=shots).result().get_counts()
-    count = _clear_counts(count)
-
-    # Get total counts in order to obtain the probability
-    total_counts = count["00"] + count["11"] + count["01"] + count["10"]
-    # Get counts for expected value
-    zz_meas = count["00"] + count["11"] - count["01"] - count["10"]
-    return zz_meas / total_counts
+    return measure_paulis(qc, ["ZZ"], backend, shots)[0]
 
 
 def measure_zi(qc, backend, shots=10000):
     """Measure the ZI expectation value for a given circuit."""
-    zi_circuit = _measure_zz_circuit(qc)
-
-    count = execute(zi_circuit, backend=backend, shots=shots).result().get_counts()
-    count = _clear_counts(count)
-
-    # Get total counts in order to obtain the probability
-    total_counts = count["00"] + count["11"] + count["01"] + count["10"]
-    # Get counts for expected value
-    zi_meas = count["00"] - count["11"] + count["01"] - count["10"]
-    return zi_meas / total_counts
+    return measure_paulis(qc, ["ZI"], backend, shots)[0]
 
 
 def measure_iz(qc, backend, shots=10000):
     """Measure the IZ expectation value for a given circuit."""
-    iz_circuit = _measure_zz_circuit(qc)
-
-    count = execute(iz_circuit, backend=backend, shots=shots).result().get_counts()
-    count = _clear_counts(count)
-
-    # Get total counts in order to obtain the probability
-    total_counts = count["00"] + count["11"] + count["01"] + count["10"]
-    # Get counts for expected value
-    iz_meas = count["00"] - count["11"] - count["01"] + count["10"]
-    return iz_meas / total_counts
+    return measure_paulis(qc, ["IZ"], backend, shots)[0]
 
 
 def measure_xx(qc, backend, shots=10000):
     """Measure the XX expectation value for a given circuit."""
-
-    def _measure_xx_circuit(
-        qc: qiskit.QuantumCircuit,
-    ) -> qiskit.QuantumCircuit:
-        """Construct the circuit to measure"""
-        xx_circuit = qc.copy()
-        xx_circuit.h(xx_circuit.qregs[0])
-        xx_circuit.measure_all()
-
-        return xx_circuit
-
-    xx_circuit = _measure_xx_circuit(qc)
-
-    count = execute(xx_circuit, backend=backend, shots=shots).result().get_counts()
-    count = _clear_counts(count)
-
-    # Get total counts in order to obtain the probability
-    total_counts = count["00"] + count["11"] + count["01"] + count["10"]
-    # Get counts for expected value
-    xx_meas = count["00"] + count["11"] - count["01"] - count["10"]
-    return xx_meas / total_counts
+    return measure_paulis(qc, ["XX"], backend, shots)[0]
 
 
 def measure_yy(qc, backend, shots=10000):
     """Measure the YY expectation value for a given circuit."""
-
-    def _measure_yy_circuit(
-        qc: qiskit.QuantumCircuit,
-    ) -> qiskit.QuantumCircuit:
-        """Construct the circuit to measure"""
-
-        yy_meas = qc.copy()
-        yy_meas.barrier(range(2))
-        yy_meas.sdg(range(2))
-        yy_meas.h(range(2))
-        yy_meas.measure_all()
-        return yy_meas
-
-    yy_circuit = _measure_yy_circuit(qc)
-
-    count = execute(yy_circuit, backend=backend, shots=shots).result().get_counts()
-    count = _clear_counts(count)
-
-    # Get total counts in order to obtain the probability
-    total_counts = count["00"] + count["11"] + count["01"] + count["10"]
-    # Get counts for expected value
-    xx_meas = count["00"] + count["11"] - count["01"] - count["10"]
-    return xx_meas / total_counts
+    return measure_paulis(qc, ["YY"], backend, shots)[0]
@@ -10,17 +10,344 @@
 from typing import Union
 import qiskit
 import numpy as np
-from qiskit.utils.backend_utils import is_aer_provider
+from qiskit.utils.backend_utils import is_aer_provider, is_statevector_backend
 from qiskit.opflow import (
     CircuitSampler,
     ExpectationFactory,
     CircuitStateFn,
+    ListOp,
     StateFn,
 )
 
+from volta.ansatz import ParameterBinder
+from volta.profiling import timed, record_jobs
+from volta.utils import submission_lock
+from volta.statevector import ExactExpectationEvaluator
+from volta.paulis import PauliSum
+
+
+def _get_sampler(
+    backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]
+) -> CircuitSampler:
+    """Creates a circuit sampler for the backend."""
+    if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
+        return CircuitSampler(backend, param_qobj=is_aer_provider(backend.backend))
+    return CircuitSampler(backend)
+
+
+def _is_statevector(
+    backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]
+) -> bool:
+    """Checks if the backend is a statevector simulator."""
+    if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
+        return backend.is_statevector
+    return is_statevector_backend(backend)
+
+
+def _measurement_op(
+    hamiltonian: Union[qiskit.opflow.OperatorBase, PauliSum],
+    backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
+) -> qiskit.opflow.OperatorBase:
+    """Builds the measurement operator of the hamiltonian for the backend."""
+    if isinstance(hamiltonian, PauliSum):
+        hamiltonian = hamiltonian.to_opflow()
+
+    expectation = ExpectationFactory.build(operator=hamiltonian, backend=backend)
+    return expectation.convert(StateFn(hamiltonian, is_measurement=True))
+
+
+def _num_circuits(operator: qiskit.opflow.OperatorBase) -> int:
+    """Number of circuits of an operator."""
+    if isinstance(operator, CircuitStateFn):
+        return 1
+    if isinstance(operator, ListOp):
+        return sum(_num_circuits(op) for op in operator.oplist)
+    return 0
+
+
+def _sample(
+    sampler: CircuitSampler,
+    operator: qiskit.opflow.OperatorBase,
+    backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
+    param_dict: dict,
+    n_circuits: int,
+) -> qiskit.opflow.OperatorBase:
+    """Binds, transpiles and runs the circuits of an operator in a single call
+    of the circuit sampler, counting the circuits and shots for the profiler."""
+    with submission_lock(backend):
+        sampled_op = sampler.convert(operator, params=param_dict)
+
+    instance = sampler.quantum_instance
+    shots = 0 if instance.is_statevector else instance.run_config.shots
+    record_jobs(n_circuits, n_circuits * shots)
+
+    return sampled_op
+
+
+class ExpectationEvaluator(object):
+    """Evaluates the expected value of a hamiltonian for a parametrized ansatz.
+
+    The measurement operator and the circuit sampler are built once for the
+    (hamiltonian, backend, ansatz) triple, so each evaluation only binds new
+    parameter values. On statevector simulators the expected value is computed
+    exactly with NumPy, without going through the circuit sampler.
+    """
+
+    def __init__(
+        self,
+        hamiltonian: Union[qiskit.opflow.OperatorBase, PauliSum],
+        backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
+        ansatz: qiskit.QuantumCircuit,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            hamiltonian (Union[qiskit.opflow.OperatorBase, PauliSum]): Hamiltonian that you want to get the
+            expected value.
+            backend (Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]): Backend
+            that you want to run.
+            ansatz (qiskit.QuantumCircuit): Parametrized quantum circuit that you want to get
+            the expectation value.
+        """
+        self.hamiltonian = hamiltonian
+        self.backend = backend
+        self.ansatz = ansatz
+
+        self._binder = ParameterBinder(ansatz)
+
+        # Exact fast path for statevector simulators
+        self._exact = None
+        if _is_statevector(backend):
+            try:
+                self._exact = ExactExpectationEvaluator(hamiltonian, ansatz)
+            except (NotImplementedError, TypeError):
+                # Fall back to the circuit sampler
+                pass
+
+        if self._exact is None:
+            self._sampler = _get_sampler(backend)
+
+            observable_meas = _measurement_op(hamiltonian, backend)
+
+            ansatz_circuit_op = CircuitStateFn(ansatz)
+
+            self._expect_op = observable_meas.compose(ansatz_circuit_op).reduce()
+            self._num_circuits = _num_circuits(self._expect_op)
+
+    @property
+    def num_parameters(self) -> int:
+        """Returns the number of free parameters of the ansatz.
+
+        Returns:
+            int: Number of parameters.
+        """
+        return self._binder.num_parameters
+
+    def evaluate(self, params: Union[list, np.array]) -> float:
+        """Evaluates the expected value for the given parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the ansatz.
+
+        Returns:
+            float: Expected value
+        """
+        param_dict = self._binder.parameter_dict(params) or None
+
+        # The circuit sampler binds, transpiles and runs in a single call
+        with timed("execution"):
+            if self._exact is not None:
+                return self._exact.evaluate(params)
+
+            sampled_expect_op = _sample(
+                self._sampler,
+                self._expect_op,
+                self.backend,
+                param_dict,
+                self._num_circuits,
+            )
+
+        with timed("post_processing"):
+            return np.real(sampled_expect_op.eval())
+
+    def evaluate_batch(self, params_batch: np.array) -> np.array:
+        """Evaluates the expected value for many parameter vectors, all the
+        circuits are sent to the backend in a single submission.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+
+        Returns:
+            np.array: Expected values with shape (B,).
+        """
+        param_dict = self._binder.parameter_lists(params_batch)
+
+        with timed("execution"):
+            if self._exact is not None:
+                return self._exact.evaluate_batch(params_batch)
+
+            sampled_expect_ops = _sample(
+                self._sampler,
+                self._expect_op,
+                self.backend,
+                param_dict,
+                self._num_circuits * len(np.atleast_2d(params_batch)),
+            )
+
+        with timed("post_processing"):
+            return np.real(np.array(sampled_expect_ops.eval(), dtype=complex))
+
+    def __call__(self, params: Union[list, np.array]) -> float:
+        return self.evaluate(params)
+
+
+class SubspaceExpectationEvaluator(object):
+    """Evaluates the expected value of a hamiltonian for many parametrized
+    circuits that share the same parameters, such as the orthogonal input
+    states of SSVQE.
+
+    The expectation operators of all the circuits are wrapped in a single
+    ListOp, so each evaluation sends every circuit to the backend in one
+    submission, no matter how many circuits there are.
+    """
+
+    def __init__(
+        self,
+        hamiltonian: Union[qiskit.opflow.OperatorBase, PauliSum],
+        backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
+        circuits: list,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            hamiltonian (Union[qiskit.opflow.OperatorBase, PauliSum]): Hamiltonian that you want to get the
+            expected value.
+            backend (Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]): Backend
+            that you want to run.
+            circuits (list): Parametrized quantum circuits that share the same parameters.
+        """
+        self.hamiltonian = hamiltonian
+        self.backend = backend
+        self.circuits = circuits
+
+        self._binder = ParameterBinder(circuits[0])
+
+        if any(
+            set(circuit.parameters) != set(self._binder.parameters)
+            for circuit in circuits
+        ):
+            raise ValueError("The circuits don't share the same parameters.")
+
+        # Exact fast path for statevector simulators
+        self._exact = None
+        if _is_statevector(backend):
+            try:
+                self._exact = [
+                    ExactExpectationEvaluator(hamiltonian, circuit)
+                    for circuit in circuits
+                ]
+            except (NotImplementedError, TypeError):
+                # Fall back to the circuit sampler
+                pass
+
+        if self._exact is None:
+            self._sampler = _get_sampler(backend)
+
+            observable_meas = _measurement_op(hamiltonian, backend)
+
+            self._expect_op = ListOp(
+                [
+                    observable_meas.compose(CircuitStateFn(circuit)).reduce()
+                    for circuit in circuits
+                ]
+            )
+            self._num_circuits = _num_circuits(self._expect_op)
+
+    @property
+    def num_parameters(self) -> int:
+        """Returns the number of free parameters of the circuits.
+
+        Returns:
+            int: Number of parameters.
+        """
+        return self._binder.num_parameters
+
+    @property
+    def num_circuits(self) -> int:
+        """Returns the number of circuits.
+
+        Returns:
+            int: Number of circuits.
+        """
+        return len(self.circuits)
+
+    def evaluate(self, params: Union[list, np.array]) -> np.array:
+        """Evaluates the expected value of every circuit for the given
+        parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the circuits.
+
+        Returns:
+            np.array: Expected values with shape (K,).
+        """
+        param_dict = self._binder.parameter_dict(params) or None
+
+        # The circuit sampler binds, transpiles and runs in a single call
+        with timed("execution"):
+            if self._exact is not None:
+                return np.array([exact.evaluate(params) for exact in self._exact])
+
+            sampled_expect_op = _sample(
+                self._sampler,
+                self._expect_op,
+                self.backend,
+                param_dict,
+                self._num_circuits,
+            )
+
+        with timed("post_processing"):
+            return np.real(np.array(sampled_expect_op.eval(), dtype=complex))
+
+    def evaluate_batch(self, params_batch: np.array) -> np.array:
+        """Evaluates the expected value of every circuit for many parameter
+        vectors, all the circuits are sent to the backend in a single submission.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+
+        Returns:
+            np.array: Expected values with shape (B, K).
+        """
+        param_dict = self._binder.parameter_lists(params_batch)
+
+        with timed("execution"):
+            if self._exact is not None:
+                return np.array(
+                    [exact.evaluate_batch(params_batch) for exact in self._exact]
+                ).T
+
+            sampled_expect_ops = _sample(
+                self._sampler,
+                self._expect_op,
+                self.backend,
+                param_dict,
+                self._num_circuits * len(np.atleast_2d(params_batch)),
+            )
+
+        with timed("post_processing"):
+            return np.real(
+                np.array(sampled_expect_ops.eval(), dtype=complex).reshape(
+                    -1, self.num_circuits
+                )
+            )
+
+    def __call__(self, params: Union[list, np.array]) -> np.array:
+        return self.evaluate(params)
+
 
 def sample_hamiltonian(
-    hamiltonian: qiskit.opflow.OperatorBase,
+    hamiltonian: Union[qiskit.opflow.OperatorBase, PauliSum],
     backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
     ansatz: qiskit.QuantumCircuit,
 ) -> float:
@@ -28,7 +355,7 @@ def sample_hamiltonian(
     and outputs the expected value given the hamiltonian.
 
     Args:
-        hamiltonian (qiskit.opflow.OperatorBase): Hamiltonian that you want to get the
+        hamiltonian (Union[qiskit.opflow.OperatorBase, PauliSum]): Hamiltonian that you want to get the
         expected value.
         backend (Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]): Backend
         that you want to run.
@@ -38,17 +365,30 @@ def sample_hamiltonian(
     Returns:
         float: Expected value
     """
-    if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
-        sampler = CircuitSampler(backend, param_qobj=is_aer_provider(backend.backend))
-    else:
-        sampler = CircuitSampler(backend)
+    return ExpectationEvaluator(hamiltonian, backend, ansatz).evaluate([])
 
-    expectation = ExpectationFactory.build(operator=hamiltonian, backend=backend)
-    observable_meas = expectation.convert(StateFn(hamiltonian, is_measurement=True))
 
-    ansatz_circuit_op = CircuitStateFn(ansatz)
+def sample_hamiltonian_batch(
+    hamiltonian: Union[qiskit.opflow.OperatorBase, PauliSum],
+    backend: Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance],
+    ansatz: qiskit.QuantumCircuit,
+    params_batch: np.array,
+) -> np.array:
+    """Samples a hamiltonian for a parametrized ansatz and many parameter
+    vectors, submitting all the circuits to the backend at once.
 
-    expect_op = observable_meas.compose(ansatz_circuit_op).reduce()
-    sampled_expect_op = sampler.convert(expect_op)
+    Args:
+        hamiltonian (Union[qiskit.opflow.OperatorBase, PauliSum]): Hamiltonian that you want to get the
+        expected value.
+        backend (Union[qiskit.providers.BaseBackend, qiskit.utils.QuantumInstance]): Backend
+        that you want to run.
+        ansatz (qiskit.QuantumCircuit): Parametrized quantum circuit that you want to get
+        the expectation value.
+        params_batch (np.array): Parameter values with shape (B, n_params).
 
-    return np.real(sampled_expect_op.eval())
+    Returns:
+        np.array: Expected values with shape (B,).
+    """
+    return ExpectationEvaluator(hamiltonian, backend, ansatz).evaluate_batch(
+        params_batch
+    )
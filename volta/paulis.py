@@ -0,0 +1,354 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from numbers import Number
+from typing import Union
+
+from qiskit.opflow import OperatorBase, ListOp, PauliOp, PauliSumOp
+from qiskit.quantum_info import SparsePauliOp, PauliTable
+
+# Number of set bits of each byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+# Powers of i
+_I_POWERS = np.array([1, 1j, -1, -1j])
+
+
+def _popcount(packed: np.array) -> np.array:
+    """Number of set bits on the last axis of a packed bit array."""
+    return _POPCOUNT[packed].sum(axis=-1)
+
+
+class PauliSum(object):
+    """Sum of Pauli strings stored as packed X and Z bit masks and a complex
+    coefficient array.
+
+    The term k is coeffs[k] * P(x[k], z[k]), where the bit q of the masks acts
+    on qubit q and a qubit with both bits set is a Y.
+    """
+
+    def __init__(
+        self, x: np.array, z: np.array, coeffs: np.array, num_qubits: int
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            x (np.array): Packed X bits with shape (n_terms, n_bytes).
+            z (np.array): Packed Z bits with shape (n_terms, n_bytes).
+            coeffs (np.array): Coefficients with shape (n_terms,).
+            num_qubits (int): Number of qubits.
+        """
+        n_bytes = (num_qubits + 7) // 8
+        self.x = np.asarray(x, dtype=np.uint8).reshape(len(coeffs), n_bytes)
+        self.z = np.asarray(z, dtype=np.uint8).reshape(len(coeffs), n_bytes)
+        self.coeffs = np.asarray(coeffs, dtype=complex)
+        self.num_qubits = num_qubits
+
+    @classmethod
+    def from_bits(
+        cls, x_bits: np.array, z_bits: np.array, coeffs: Union[list, np.array]
+    ) -> "PauliSum":
+        """Creates a Pauli sum from boolean arrays.
+
+        Args:
+            x_bits (np.array): X bits with shape (n_terms, num_qubits).
+            z_bits (np.array): Z bits with shape (n_terms, num_qubits).
+            coeffs (Union[list, np.array]): Coefficients of each term.
+
+        Returns:
+            PauliSum: Pauli sum.
+        """
+        x_bits = np.asarray(x_bits, dtype=bool)
+        z_bits = np.asarray(z_bits, dtype=bool)
+        return cls(
+            np.packbits(x_bits, axis=1, bitorder="little"),
+            np.packbits(z_bits, axis=1, bitorder="little"),
+            coeffs,
+            x_bits.shape[1],
+        )
+
+    @classmethod
+    def from_labels(
+        cls, labels: list, coeffs: Union[list, np.array] = None
+    ) -> "PauliSum":
+        """Creates a Pauli sum from Pauli labels, the first character acts on
+        the last qubit.
+
+        Args:
+            labels (list): Pauli labels.
+            coeffs (Union[list, np.array], optional): Coefficients of each label.
+            Defaults to ones.
+
+        Returns:
+            PauliSum: Pauli sum.
+        """
+        if coeffs is None:
+            coeffs = np.ones(len(labels))
+
+        chars = np.array([list(reversed(label)) for label in labels]).reshape(
+            len(labels), -1
+        )
+        return cls.from_bits(
+            (chars == "X") | (chars == "Y"), (chars == "Z") | (chars == "Y"), coeffs
+        )
+
+    @classmethod
+    def from_sparse_pauli_op(cls, operator: SparsePauliOp) -> "PauliSum":
+        """Creates a Pauli sum from a SparsePauliOp.
+
+        Args:
+            operator (SparsePauliOp): Sparse Pauli operator.
+
+        Returns:
+            PauliSum: Pauli sum.
+        """
+        return cls.from_bits(operator.table.X, operator.table.Z, operator.coeffs)
+
+    @classmethod
+    def from_operator(
+        cls, operator: Union[OperatorBase, SparsePauliOp, "PauliSum"]
+    ) -> "PauliSum":
+        """Creates a Pauli sum from an opflow operator made of Pauli operators.
+
+        Args:
+            operator (Union[OperatorBase, SparsePauliOp, PauliSum]): Operator.
+
+        Returns:
+            PauliSum: Pauli sum.
+        """
+        if isinstance(operator, PauliSum):
+            return operator
+
+        if isinstance(operator, SparsePauliOp):
+            return cls.from_sparse_pauli_op(operator)
+
+        if isinstance(operator, PauliSumOp):
+            return operator.coeff * cls.from_sparse_pauli_op(operator.primitive)
+
+        if isinstance(operator, PauliOp):
+            pauli = operator.primitive
+            coeff = operator.coeff * (-1j) ** pauli.phase
+            return cls.from_bits([pauli.x], [pauli.z], [coeff])
+
+        if isinstance(operator, ListOp) and operator.oplist:
+            terms = [cls.from_operator(op) for op in operator.oplist]
+            return operator.coeff * cls.concatenate(terms)
+
+        raise TypeError(f"Operator of type {type(operator)} is not a Pauli sum.")
+
+    @classmethod
+    def concatenate(cls, terms: list) -> "PauliSum":
+        """Concatenates the terms of Pauli sums acting on the same qubits.
+
+        Args:
+            terms (list): Pauli sums.
+
+        Returns:
+            PauliSum: Pauli sum with all the terms.
+        """
+        num_qubits = terms[0].num_qubits
+        if any(term.num_qubits != num_qubits for term in terms):
+            raise ValueError("The Pauli sums act on a different number of qubits.")
+
+        return cls(
+            np.concatenate([term.x for term in terms]),
+            np.concatenate([term.z for term in terms]),
+            np.concatenate([term.coeffs for term in terms]),
+            num_qubits,
+        )
+
+    def __len__(self) -> int:
+        return len(self.coeffs)
+
+    @property
+    def num_terms(self) -> int:
+        """Returns the number of terms.
+
+        Returns:
+            int: Number of terms.
+        """
+        return len(self.coeffs)
+
+    def x_bits(self) -> np.array:
+        """Returns the unpacked X bits with shape (n_terms, num_qubits)."""
+        return np.unpackbits(self.x, axis=1, count=self.num_qubits, bitorder="little")
+
+    def z_bits(self) -> np.array:
+        """Returns the unpacked Z bits with shape (n_terms, num_qubits)."""
+        return np.unpackbits(self.z, axis=1, count=self.num_qubits, bitorder="little")
+
+    def _masks(self, packed: np.array) -> np.array:
+        """Integer masks from packed bits."""
+        if self.num_qubits > 62:
+            raise ValueError("Integer masks are only available up to 62 qubits.")
+        weights = 2 ** (8 * np.arange(packed.shape[1], dtype=np.int64))
+        return packed.astype(np.int64) @ weights
+
+    def x_masks(self) -> np.array:
+        """Returns the X bits of each term as an integer, bit q is the qubit q."""
+        return self._masks(self.x)
+
+    def z_masks(self) -> np.array:
+        """Returns the Z bits of each term as an integer, bit q is the qubit q."""
+        return self._masks(self.z)
+
+    def num_y(self) -> np.array:
+        """Returns the number of Y operators of each term."""
+        return _popcount(self.x & self.z)
+
+    def labels(self) -> list:
+        """Returns the Pauli labels, the first character acts on the last qubit.
+
+        Returns:
+            list: Pauli labels.
+        """
+        codes = 2 * self.x_bits() + self.z_bits()
+        chars = np.array(list("IZXY"))[codes[:, ::-1]]
+        return ["".join(row) for row in chars]
+
+    def to_sparse_pauli_op(self) -> SparsePauliOp:
+        """Converts to a SparsePauliOp.
+
+        Returns:
+            SparsePauliOp: Sparse Pauli operator.
+        """
+        table = PauliTable(np.hstack([self.x_bits(), self.z_bits()]).astype(bool))
+        return SparsePauliOp(table, self.coeffs)
+
+    def to_opflow(self) -> PauliSumOp:
+        """Converts to an opflow operator.
+
+        Returns:
+            PauliSumOp: Opflow operator.
+        """
+        return PauliSumOp(self.to_sparse_pauli_op())
+
+    def to_matrix(self) -> np.array:
+        """Returns the dense matrix of the operator.
+
+        Returns:
+            np.array: Matrix.
+        """
+        return self.to_sparse_pauli_op().to_matrix()
+
+    def simplify(self, atol: float = 1e-12) -> "PauliSum":
+        """Merges repeated Pauli strings and removes terms with zero coefficient.
+
+        Args:
+            atol (float, optional): Absolute tolerance for a zero coefficient.
+            Defaults to 1e-12.
+
+        Returns:
+            PauliSum: Simplified Pauli sum.
+        """
+        if self.num_terms == 0:
+            return self
+
+        keys = np.hstack([self.x, self.z])
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        coeffs = np.zeros(len(unique), dtype=complex)
+        np.add.at(coeffs, inverse.reshape(-1), self.coeffs)
+
+        keep = np.abs(coeffs) > atol
+        n_bytes = self.x.shape[1]
+        return PauliSum(
+            unique[keep, :n_bytes],
+            unique[keep, n_bytes:],
+            coeffs[keep],
+            self.num_qubits,
+        )
+
+    def compose(self, other: "PauliSum") -> "PauliSum":
+        """Operator product self * other, computed for all pairs of terms.
+
+        Args:
+            other (PauliSum): Pauli sum on the right.
+
+        Returns:
+            PauliSum: Product of the Pauli sums.
+        """
+        if other.num_qubits != self.num_qubits:
+            raise ValueError("The Pauli sums act on a different number of qubits.")
+
+        x1, z1 = self.x[:, None, :], self.z[:, None, :]
+        x2, z2 = other.x[None, :, :], other.z[None, :, :]
+        x3, z3 = x1 ^ x2, z1 ^ z2
+
+        # P(x, z) = i^|x & z| X^x Z^z
+        exponent = (
+            _popcount(x1 & z1)
+            + _popcount(x2 & z2)
+            - _popcount(x3 & z3)
+            + 2 * _popcount(z1 & x2)
+        )
+        coeffs = self.coeffs[:, None] * other.coeffs[None, :] * _I_POWERS[exponent % 4]
+
+        n_bytes = self.x.shape[1]
+        return PauliSum(
+            x3.reshape(-1, n_bytes),
+            z3.reshape(-1, n_bytes),
+            coeffs.reshape(-1),
+            self.num_qubits,
+        )
+
+    def tensor(self, other: "PauliSum") -> "PauliSum":
+        """Tensor product self ^ other, where self acts on the last qubits.
+
+        Args:
+            other (PauliSum): Pauli sum acting on the first qubits.
+
+        Returns:
+            PauliSum: Tensor product of the Pauli sums.
+        """
+        n1, n2 = self.num_terms, other.num_terms
+        x_bits = np.hstack(
+            [np.repeat(other.x_bits(), n1, axis=0), np.tile(self.x_bits(), (n2, 1))]
+        )
+        z_bits = np.hstack(
+            [np.repeat(other.z_bits(), n1, axis=0), np.tile(self.z_bits(), (n2, 1))]
+        )
+        coeffs = np.outer(other.coeffs, self.coeffs).reshape(-1)
+        return PauliSum.from_bits(x_bits, z_bits, coeffs)
+
+    def __add__(self, other: Union["PauliSum", Number]) -> "PauliSum":
+        if isinstance(other, Number) and other == 0:
+            return self
+        return PauliSum.concatenate([self, other])
+
+    def __radd__(self, other: Union["PauliSum", Number]) -> "PauliSum":
+        return self.__add__(other)
+
+    def __neg__(self) -> "PauliSum":
+        return PauliSum(self.x, self.z, -self.coeffs, self.num_qubits)
+
+    def __sub__(self, other: "PauliSum") -> "PauliSum":
+        return self + (-other)
+
+    def __mul__(self, other: Union["PauliSum", Number]) -> "PauliSum":
+        if isinstance(other, PauliSum):
+            return self.compose(other)
+        return PauliSum(self.x, self.z, other * self.coeffs, self.num_qubits)
+
+    def __rmul__(self, other: Number) -> "PauliSum":
+        return PauliSum(self.x, self.z, other * self.coeffs, self.num_qubits)
+
+    def __matmul__(self, other: "PauliSum") -> "PauliSum":
+        return self.compose(other)
+
+    def __xor__(self, other: "PauliSum") -> "PauliSum":
+        return self.tensor(other)
+
+    def __repr__(self) -> str:
+        terms = " + ".join(
+            f"{coeff} * {label}" for coeff, label in zip(self.coeffs, self.labels())
+        )
+        return f"PauliSum({terms})"
@@ -0,0 +1,187 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import csv
+import json
+import time
+import threading
+
+from contextlib import contextmanager
+from typing import Callable
+
+# Sections of the hot path that are timed
+SECTIONS = ["binding", "construction", "transpilation", "execution", "post_processing"]
+
+# Parts of a cost evaluation
+PARTS = ["energy", "overlap"]
+
+# Profiler and part recorded by each thread
+_THREAD_STATE = threading.local()
+
+
+class Profiler(object):
+    """Records, for each cost evaluation, the time spent on each section of the
+    hot path and the circuits and shots sent to the backend, split between
+    the energy and the overlap parts.
+
+    Each finished record is passed to the callbacks and kept for export.
+    """
+
+    def __init__(self, callbacks: list = None) -> None:
+        """Initialize the class.
+
+        Args:
+            callbacks (list, optional): Functions called with the record of each
+            cost evaluation. Defaults to None.
+        """
+        self.callbacks = list(callbacks) if callbacks is not None else []
+        self.records = []
+
+        self._current = None
+        self._start_time = None
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable) -> None:
+        """Adds a function called with the record of each cost evaluation.
+
+        Args:
+            callback (Callable): Function of the record.
+        """
+        self.callbacks.append(callback)
+
+    def start(self) -> None:
+        """Starts the record of a cost evaluation."""
+        self._current = {"evaluation": len(self.records), "time": 0.0}
+        for part in PARTS:
+            for section in SECTIONS:
+                self._current[f"{part}_{section}_time"] = 0.0
+            self._current[f"{part}_circuits"] = 0
+            self._current[f"{part}_shots"] = 0
+        self._start_time = time.perf_counter()
+
+    def stop(self, **values) -> dict:
+        """Finishes the record of a cost evaluation and calls the callbacks.
+
+        Args:
+            **values: Extra values of the record, such as the cost.
+
+        Returns:
+            dict: Record of the cost evaluation.
+        """
+        record = self._current
+        record["time"] = time.perf_counter() - self._start_time
+        record.update(values)
+
+        self.records.append(record)
+        self._current = None
+
+        for callback in self.callbacks:
+            callback(record)
+
+        return record
+
+    def add_time(self, part: str, section: str, seconds: float) -> None:
+        """Adds time to a section of the current cost evaluation."""
+        if self._current is not None:
+            with self._lock:
+                self._current[f"{part}_{section}_time"] += seconds
+
+    def add_jobs(self, part: str, circuits: int, shots: int) -> None:
+        """Adds circuits and shots to the current cost evaluation."""
+        if self._current is not None:
+            with self._lock:
+                self._current[f"{part}_circuits"] += circuits
+                self._current[f"{part}_shots"] += shots
+
+    def summary(self) -> dict:
+        """Returns the totals of every numeric field over all the records.
+
+        Returns:
+            dict: Totals of each field.
+        """
+        totals = {}
+        for record in self.records:
+            for key, value in record.items():
+                if key != "evaluation" and isinstance(value, (int, float)):
+                    totals[key] = totals.get(key, 0) + value
+        totals["evaluations"] = len(self.records)
+        return totals
+
+    def to_json(self, path: str) -> None:
+        """Exports the records to a JSON file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.records, f, indent=2, default=float)
+
+    def to_csv(self, path: str) -> None:
+        """Exports the records to a CSV file, one row for each cost evaluation.
+
+        Args:
+            path (str): Path of the file.
+        """
+        fields = []
+        for record in self.records:
+            fields += [key for key in record if key not in fields]
+
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+
+@contextmanager
+def recording(profiler: Profiler, part: str):
+    """Records the timed sections of this thread on a part of the profiler.
+
+    Args:
+        profiler (Profiler): Profiler, if None nothing is recorded.
+        part (str): Part of the cost evaluation, one of energy and overlap.
+    """
+    previous = getattr(_THREAD_STATE, "target", None)
+    _THREAD_STATE.target = None if profiler is None else (profiler, part)
+    try:
+        yield
+    finally:
+        _THREAD_STATE.target = previous
+
+
+@contextmanager
+def timed(section: str):
+    """Times a section of the hot path for the profiler recording this thread.
+
+    Args:
+        section (str): Section, one of SECTIONS.
+    """
+    target = getattr(_THREAD_STATE, "target", None)
+    if target is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler, part = target
+        profiler.add_time(part, section, time.perf_counter() - start)
+
+
+def record_jobs(circuits: int, shots: int) -> None:
+    """Counts circuits and shots for the profiler recording this thread.
+
+    Args:
+        circuits (int): Number of circuits.
+        shots (int): Total number of shots.
+    """
+    target = getattr(_THREAD_STATE, "target", None)
+    if target is not None:
+        profiler, part = target
+        profiler.add_jobs(part, circuits, shots)
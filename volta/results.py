@@ -0,0 +1,224 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from qiskit import QuantumCircuit
+
+from volta.ansatz import ParameterBinder
+
+# Per-evaluation traces
+_TRACES = ["state", "cost", "energy", "penalty"]
+
+
+class RunResult(object):
+    """Results of an excited-state run stored in preallocated NumPy arrays.
+
+    It keeps the energy, optimal parameters and number of cost evaluations of
+    each state and per-evaluation traces of the cost, energy and penalty.
+    States are not stored as circuits, they are rebuilt from the optimal
+    parameters when needed.
+    """
+
+    def __init__(self, n_states: int, n_parameters: int, capacity: int = 1024) -> None:
+        """Initialize the class.
+
+        Args:
+            n_states (int): Number of states of the run.
+            n_parameters (int): Number of parameters of the ansatz.
+            capacity (int, optional): Initial number of evaluations of the traces, which
+            double their size when full. Defaults to 1024.
+        """
+        self.n_states = n_states
+        self.n_parameters = n_parameters
+
+        self._energies = np.full(n_states, np.nan)
+        self._optimal_params = np.full((n_states, n_parameters), np.nan)
+        self._n_evaluations = np.zeros(n_states, dtype=np.int64)
+        self._found = np.zeros(n_states, dtype=bool)
+
+        self._traces = {
+            "state": np.zeros(capacity, dtype=np.int64),
+            "cost": np.zeros(capacity),
+            "energy": np.zeros(capacity),
+            "penalty": np.zeros(capacity),
+        }
+        self._n_trace = 0
+
+    @property
+    def num_found(self) -> int:
+        """Returns the number of states found.
+
+        Returns:
+            int: Number of states found.
+        """
+        return int(self._found.sum())
+
+    def add_state(self, index: int, optimal_params: np.array, energy: float) -> None:
+        """Stores the optimal parameters and energy of a state.
+
+        Args:
+            index (int): Index of the state in the run.
+            optimal_params (np.array): Optimal parameters.
+            energy (float): Energy of the state.
+        """
+        self._optimal_params[index] = optimal_params
+        self._energies[index] = energy
+        self._found[index] = True
+
+    def record(self, state: int, cost: float, energy: float, penalty: float) -> None:
+        """Appends a cost evaluation to the traces. Evaluations once every state
+        was found, such as calling the cost function after the run, are traced
+        under the index n_states but not counted on any state.
+
+        Args:
+            state (int): Index of the state being optimized.
+            cost (float): Cost function value.
+            energy (float): Energy.
+            penalty (float): Overlap penalty.
+        """
+        if self._n_trace == len(self._traces["cost"]):
+            for name, trace in self._traces.items():
+                self._traces[name] = np.concatenate([trace, np.zeros_like(trace)])
+
+        i = self._n_trace
+        self._traces["state"][i] = state
+        self._traces["cost"][i] = cost
+        self._traces["energy"][i] = energy
+        self._traces["penalty"][i] = penalty
+        self._n_trace += 1
+
+        if state < self.n_states:
+            self._n_evaluations[state] += 1
+
+    @property
+    def order(self) -> np.array:
+        """Returns the indices of the states found, sorted by energy.
+
+        Returns:
+            np.array: Indices of the states.
+        """
+        found = np.flatnonzero(self._found)
+        return found[np.argsort(self._energies[found], kind="stable")]
+
+    @property
+    def energies(self) -> np.array:
+        """Returns the energies of the states found, sorted by value.
+
+        Returns:
+            np.array: Energies.
+        """
+        return self._energies[self.order]
+
+    @property
+    def optimal_params(self) -> np.array:
+        """Returns the optimal parameters of the states found, sorted by energy.
+
+        Returns:
+            np.array: Optimal parameters with shape (n_found, n_parameters).
+        """
+        return self._optimal_params[self.order]
+
+    @property
+    def state_energies(self) -> np.array:
+        """Returns the energies in the order the states were found.
+
+        Returns:
+            np.array: Energies.
+        """
+        return self._energies[self._found]
+
+    @property
+    def state_params(self) -> np.array:
+        """Returns the optimal parameters in the order the states were found.
+
+        Returns:
+            np.array: Optimal parameters with shape (n_found, n_parameters).
+        """
+        return self._optimal_params[self._found]
+
+    @property
+    def n_evaluations(self) -> np.array:
+        """Returns the number of cost evaluations of each state.
+
+        Returns:
+            np.array: Number of evaluations.
+        """
+        return self._n_evaluations
+
+    def trace(self, state: int = None) -> dict:
+        """Returns the per-evaluation traces.
+
+        Args:
+            state (int, optional): Index of the state, if None the traces of all the
+            states. Defaults to None.
+
+        Returns:
+            dict: Arrays of the state, cost, energy and penalty of each evaluation.
+        """
+        traces = {name: trace[: self._n_trace] for name, trace in self._traces.items()}
+        if state is None:
+            return traces
+
+        mask = traces["state"] == state
+        return {name: trace[mask] for name, trace in traces.items()}
+
+    def states(self, ansatz: QuantumCircuit) -> list:
+        """Rebuilds the states found, sorted by energy.
+
+        Args:
+            ansatz (QuantumCircuit): Parametrized ansatz of the run.
+
+        Returns:
+            list: Bound circuit of each state.
+        """
+        return ParameterBinder(ansatz).bind_batch(self.optimal_params)
+
+    def save(self, path: str) -> None:
+        """Saves the results to a npz file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        traces = self.trace()
+        np.savez(
+            path,
+            energies=self._energies,
+            optimal_params=self._optimal_params,
+            n_evaluations=self._n_evaluations,
+            found=self._found,
+            **{f"trace_{name}": traces[name] for name in _TRACES},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "RunResult":
+        """Loads results from a npz file.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            RunResult: Results.
+        """
+        with np.load(path) as data:
+            n_states, n_parameters = data["optimal_params"].shape
+            result = cls(
+                n_states, n_parameters, capacity=max(len(data["trace_cost"]), 1)
+            )
+
+            result._energies = data["energies"]
+            result._optimal_params = data["optimal_params"]
+            result._n_evaluations = data["n_evaluations"]
+            result._found = data["found"]
+
+            result._n_trace = len(data["trace_cost"])
+            for name in _TRACES:
+                result._traces[name][: result._n_trace] = data[f"trace_{name}"]
+
+        return result
@@ -0,0 +1,214 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from typing import Union
+
+from qiskit import QuantumCircuit
+from qiskit.opflow import OperatorBase
+from qiskit.utils import QuantumInstance
+from qiskit.providers import BaseBackend
+
+from volta.counts import counts_to_arrays, parity
+from volta.grouping import measurement_circuit
+from volta.paulis import PauliSum
+from volta.utils import get_counts
+
+# Measurement bases of the snapshots
+_BASES = "XYZ"
+
+# Snapshot of each basis and outcome: 3 |b><b| - I on the eigenstate b
+_SNAPSHOTS = np.array(
+    [
+        [3 * np.outer(v, v.conj()) - np.eye(2) for v in vectors]
+        for vectors in [
+            np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+            np.array([[1, 1j], [1, -1j]]) / np.sqrt(2),
+            np.eye(2),
+        ]
+    ]
+)
+
+
+def _median_of_means(values: np.array, n_groups: int) -> np.array:
+    """Median of means over the last axis."""
+    n_groups = max(1, min(n_groups, values.shape[-1]))
+    means = [chunk.mean(axis=-1) for chunk in np.array_split(values, n_groups, axis=-1)]
+    return np.median(means, axis=0)
+
+
+class ClassicalShadow(object):
+    """Classical shadow of a state made of randomized Pauli basis snapshots.
+
+    Many observables can be estimated from the same snapshots with
+    median-of-means, instead of one measurement campaign per observable.
+    """
+
+    def __init__(self, bases: np.array, outcomes: np.array) -> None:
+        """Initialize the class.
+
+        Args:
+            bases (np.array): Measurement basis of each snapshot and qubit, with shape
+            (n_snapshots, n_qubits), where 0, 1 and 2 are X, Y and Z.
+            outcomes (np.array): Measured bit of each snapshot and qubit, with the
+            same shape as the bases.
+        """
+        self.bases = np.asarray(bases, dtype=np.int8)
+        self.outcomes = np.asarray(outcomes, dtype=np.uint8)
+        self.n_qubits = self.bases.shape[1]
+
+        # Outcomes as integers, bit q is the qubit q
+        self._outcome_ints = self.outcomes.astype(np.int64) @ (
+            1 << np.arange(self.n_qubits, dtype=np.int64)
+        )
+
+    @property
+    def num_snapshots(self) -> int:
+        """Returns the number of snapshots.
+
+        Returns:
+            int: Number of snapshots.
+        """
+        return len(self.bases)
+
+    def _pauli_snapshots(self, paulis: PauliSum) -> np.array:
+        """Single snapshot estimates of each Pauli term, with shape
+        (n_terms, n_snapshots)."""
+        x_bits, z_bits = paulis.x_bits(), paulis.z_bits()
+        support = (x_bits | z_bits).astype(bool)
+
+        # Basis that each term needs on each qubit
+        codes = np.where(x_bits & z_bits, 1, np.where(x_bits, 0, 2))
+
+        estimates = np.zeros((paulis.num_terms, self.num_snapshots))
+        for t in range(paulis.num_terms):
+            match = np.all(self.bases[:, support[t]] == codes[t, support[t]], axis=1)
+            mask = int(support[t] @ (1 << np.arange(self.n_qubits, dtype=np.int64)))
+            signs = 1 - 2 * parity(self._outcome_ints[match] & mask)
+            estimates[t, match] = 3 ** int(support[t].sum()) * signs
+        return estimates
+
+    def estimate_paulis(
+        self, paulis: Union[list, PauliSum], n_groups: int = 10
+    ) -> np.array:
+        """Estimates the expected value of Pauli strings.
+
+        Args:
+            paulis (Union[list, PauliSum]): Pauli labels or Pauli sum, whose coefficients
+            are ignored.
+            n_groups (int, optional): Number of groups for the median-of-means.
+            Defaults to 10.
+
+        Returns:
+            np.array: Expected value of each Pauli string.
+        """
+        if not isinstance(paulis, PauliSum):
+            paulis = PauliSum.from_labels(paulis)
+        return _median_of_means(self._pauli_snapshots(paulis), n_groups)
+
+    def estimate(
+        self, hamiltonian: Union[OperatorBase, PauliSum], n_groups: int = 10
+    ) -> float:
+        """Estimates the expected value of a hamiltonian.
+
+        Args:
+            hamiltonian (Union[OperatorBase, PauliSum]): Hamiltonian made of Pauli operators.
+            n_groups (int, optional): Number of groups for the median-of-means.
+            Defaults to 10.
+
+        Returns:
+            float: Expected value
+        """
+        paulis = PauliSum.from_operator(hamiltonian).simplify()
+        values = np.real(paulis.coeffs @ self._pauli_snapshots(paulis))
+        return _median_of_means(values, n_groups)
+
+    def estimate_fidelity(
+        self, statevector: np.array, n_groups: int = 10, chunk_size: int = 256
+    ) -> float:
+        """Estimates the fidelity <psi|rho|psi> with a pure state.
+
+        Args:
+            statevector (np.array): Statevector of the pure state, with qiskit's qubit
+            ordering.
+            n_groups (int, optional): Number of groups for the median-of-means.
+            Defaults to 10.
+            chunk_size (int, optional): Number of snapshots processed at once.
+            Defaults to 256.
+
+        Returns:
+            float: Fidelity.
+        """
+        psi = np.asarray(statevector, dtype=complex)
+        n = self.n_qubits
+
+        values = np.zeros(self.num_snapshots)
+        for start in range(0, self.num_snapshots, chunk_size):
+            bases = self.bases[start : start + chunk_size]
+            outcomes = self.outcomes[start : start + chunk_size]
+
+            phi = np.tile(psi, (len(bases), 1))
+            for q in range(n):
+                local = _SNAPSHOTS[bases[:, q], outcomes[:, q]]
+                phi = phi.reshape(len(bases), 2 ** (n - 1 - q), 2, 2**q)
+                phi = np.einsum("cij,cajb->caib", local, phi)
+
+            values[start : start + chunk_size] = np.real(
+                phi.reshape(len(bases), -1) @ psi.conj()
+            )
+        return _median_of_means(values, n_groups)
+
+
+def collect_shadow(
+    qc: QuantumCircuit,
+    backend: Union[BaseBackend, QuantumInstance],
+    n_snapshots: int = 1000,
+    seed: int = None,
+) -> ClassicalShadow:
+    """Collects a classical shadow of a state with random Pauli measurements.
+
+    Snapshots that share the same bases are measured by the same circuit, with
+    one shot for each snapshot, with one submission for each distinct number of
+    snapshots of a setting.
+
+    Args:
+        qc (QuantumCircuit): Quantum circuit for the state.
+        backend (Union[BaseBackend, QuantumInstance]): Backend.
+        n_snapshots (int, optional): Number of snapshots. Defaults to 1000.
+        seed (int, optional): Seed for the random bases. Defaults to None.
+
+    Returns:
+        ClassicalShadow: Classical shadow of the state.
+    """
+    n_qubits = qc.num_qubits
+    rng = np.random.RandomState(seed)
+    random_bases = rng.randint(3, size=(n_snapshots, n_qubits))
+
+    settings, num_shots = np.unique(random_bases, axis=0, return_counts=True)
+
+    # The first character of the label acts on the last qubit
+    circuits = [
+        measurement_circuit(qc, "".join(_BASES[b] for b in reversed(setting)))
+        for setting in settings
+    ]
+    counts = get_counts(circuits, backend, num_shots)
+
+    bases, outcomes = [], []
+    for setting, count in zip(settings, counts):
+        setting_outcomes, weights = counts_to_arrays(count)
+        setting_outcomes = np.repeat(setting_outcomes, weights.astype(int))
+
+        bases.append(np.tile(setting, (len(setting_outcomes), 1)))
+        outcomes.append((setting_outcomes[:, None] >> np.arange(n_qubits)) & 1)
+
+    # The snapshots are grouped by setting, they are shuffled so that every
+    # median-of-means group holds a random sample of the settings
+    order = rng.permutation(n_snapshots)
+    return ClassicalShadow(np.vstack(bases)[order], np.vstack(outcomes)[order])
@@ -0,0 +1,90 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from typing import Union
+
+
+class ShotAllocator(object):
+    """Splits a shot budget across measurements in proportion to their
+    estimated standard deviation.
+
+    For a sum of independent estimates the variance sum_g std_g^2 / shots_g is
+    minimized by taking shots_g proportional to std_g. The standard deviations
+    start from a prior, for example the sum of |coefficient| of each group, and
+    are updated from the measured counts between optimizer iterations.
+    """
+
+    def __init__(
+        self,
+        total_shots: int,
+        prior: Union[list, np.array],
+        min_shots: int = 100,
+        decay: float = 0.5,
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            total_shots (int): Shot budget for each evaluation.
+            prior (Union[list, np.array]): Prior standard deviation of each measurement.
+            min_shots (int, optional): Minimum number of shots for each measurement,
+            so every standard deviation keeps being estimated. Defaults to 100.
+            decay (float, optional): Weight of the previous estimate when updating the
+            standard deviations. Defaults to 0.5.
+        """
+        self.total_shots = total_shots
+        self.min_shots = min(min_shots, total_shots // max(len(prior), 1))
+        self.decay = decay
+
+        self._stds = np.abs(np.asarray(prior, dtype=float))
+
+        if self.min_shots < 1:
+            raise ValueError(
+                f"A budget of {total_shots} shots is not enough for {len(prior)} measurements."
+            )
+
+    @property
+    def stds(self) -> np.array:
+        """Returns the current standard deviation estimates.
+
+        Returns:
+            np.array: Standard deviation of each measurement.
+        """
+        return self._stds
+
+    def allocate(self) -> np.array:
+        """Splits the budget according to the current standard deviations.
+
+        Returns:
+            np.array: Number of shots for each measurement, adding up to the budget.
+        """
+        n_meas = len(self._stds)
+        free_shots = self.total_shots - n_meas * self.min_shots
+
+        if np.sum(self._stds) > 0:
+            weights = self._stds / np.sum(self._stds)
+        else:
+            weights = np.full(n_meas, 1 / n_meas)
+
+        # Largest remainder rounding
+        raw = free_shots * weights
+        shots = np.floor(raw).astype(int)
+        remainder = free_shots - np.sum(shots)
+        shots[np.argsort(shots - raw)[:remainder]] += 1
+
+        return shots + self.min_shots
+
+    def update(self, stds: Union[list, np.array]) -> None:
+        """Updates the standard deviation estimates with new measurements.
+
+        Args:
+            stds (Union[list, np.array]): Measured standard deviation of each measurement.
+        """
+        self._stds = self.decay * self._stds + (1 - self.decay) * np.asarray(stds)
@@ -8,7 +8,6 @@
 
 
 import numpy as np
-import textwrap
 from typing import Union
 
 from functools import partial
@@ -21,7 +20,74 @@ from qiskit.algorithms.optimizers import Optimizer
 from qiskit.utils import QuantumInstance
 from qiskit.providers import BaseBackend
 
-from volta.observables import sample_hamiltonian
+from volta.utils import (
+    backend_config,
+    backend_from_config,
+    parallel_map,
+    multistart_statistics,
+)
+from volta.ansatz import ParameterBinder
+from volta.cache import CostCache
+from volta.profiling import Profiler, recording
+from volta.results import RunResult
+from volta.observables import SubspaceExpectationEvaluator
+from volta.gradients import ParameterShiftGradient
+
+
+def _weighted_energy(
+    evaluator: SubspaceExpectationEvaluator, params: Union[list, np.array]
+) -> float:
+    """Energies of the input states weighted by decreasing weights, the
+    first cost function of SSVQE."""
+    w = np.arange(evaluator.num_circuits, 0, -1)
+    return w @ evaluator.evaluate(params)
+
+
+def _weighted_gradient(
+    evaluator: SubspaceExpectationEvaluator,
+    gradient_engine: ParameterShiftGradient,
+    params: Union[list, np.array],
+) -> np.array:
+    """Parameter-shift gradient of the first cost function of SSVQE, with all
+    the shifted parameters and input states in one batch."""
+    w = np.arange(evaluator.num_circuits, 0, -1)
+    shifted = gradient_engine.shifted_parameters(params)
+    return gradient_engine.gradient_from_values(evaluator.evaluate_batch(shifted) @ w)
+
+
+def _optimize_subspace_start(
+    settings: dict, initial_point: np.array
+) -> (np.array, float, int):
+    """Minimizes the first cost function of SSVQE from an initial point on a
+    worker process.
+
+    Args:
+        settings (dict): Picklable settings, see SSVQE._worker_settings.
+        initial_point (np.array): Initial parameters.
+
+    Returns:
+        np.array: Optimal parameters.
+        float: Optimal value of the cost function.
+        int: Number of iterations.
+    """
+    evaluator = SubspaceExpectationEvaluator(
+        hamiltonian=settings["hamiltonian"],
+        backend=backend_from_config(settings["backend"]),
+        circuits=settings["states"],
+    )
+
+    gradient_function = None
+    if settings["gradient_method"] == "param_shift":
+        gradient_function = partial(
+            _weighted_gradient, evaluator, ParameterShiftGradient(settings["ansatz"])
+        )
+
+    return settings["optimizer"].optimize(
+        num_vars=len(settings["ansatz"].parameters),
+        objective_function=partial(_weighted_energy, evaluator),
+        gradient_function=gradient_function,
+        initial_point=initial_point,
+    )
 
 
 class SSVQE(object):
@@ -39,6 +105,12 @@ class SSVQE(object):
         backend: Union[BaseBackend, QuantumInstance],
         optimizer: Optimizer,
         n_excited: int,
+        gradient_method: str = None,
+        n_starts: int = 1,
+        n_jobs: int = 1,
+        seed: int = None,
+        cost_cache: CostCache = None,
+        profiler: Profiler = None,
         debug: bool = False,
     ) -> None:
         """Initialize the class.
@@ -50,6 +122,20 @@ class SSVQE(object):
             optimizer (qiskit.aqua.components.optimizers.Optimizer): Classical Optimizers
             from aqua components.
             backend (Union[BaseBackend, QuantumInstance]): Backend for running the algorithm.
+            n_excited (int): Number of states in the subspace.
+            gradient_method (str): Gradient given to the optimizer. Methods available:
+            param_shift. If None, the optimizer uses its own gradient. (Default: None)
+            n_starts (int): Number of optimizations from different random initial points, the
+            best one is kept. (Default: 1)
+            n_jobs (int): Number of processes for the starts, if None it uses all the cores.
+            Each process rebuilds the energy evaluator from picklable settings, so the
+            backend must be an Aer or BasicAer simulator. (Default: 1)
+            seed (int): Seed for the initial points. If None, the initial points come from
+            numpy's global random state. (Default: None)
+            cost_cache (CostCache): Cache of the first cost function values. With many starts
+            in a pool, each process uses its own copy. (Default: None)
+            profiler (Profiler): Records the timings, circuits and shots of each cost and gradient
+            evaluation. Starts running in a pool of processes are not recorded. (Default: None)
         """
 
         # Input parameters
@@ -57,6 +143,16 @@ class SSVQE(object):
         self.n_qubits = hamiltonian.num_qubits
         self.optimizer = optimizer
         self.backend = backend
+        self.gradient_method = gradient_method
+
+        IMPLEMENTED_GRADIENT_METHODS = ["param_shift"]
+        if (
+            gradient_method is not None
+            and gradient_method not in IMPLEMENTED_GRADIENT_METHODS
+        ):
+            raise NotImplementedError(
+                f"gradient method not implemented. Available implementing methods: {IMPLEMENTED_GRADIENT_METHODS}"
+            )
 
         # Helper Parameters
         self.ansatz = ansatz
@@ -66,6 +162,33 @@ class SSVQE(object):
         self._ansatz_1_params = None
         self._first_optimization = False
         self._n_excited = n_excited
+
+        # Multi-start
+        self.n_starts = n_starts
+        self.n_jobs = n_jobs
+        self.seed = seed
+        self.cost_cache = cost_cache
+        self.profiler = profiler
+        self._multistart = None
+
+        # Results, the subspace optimization is traced on the first state
+        self._result = RunResult(self._n_excited, self.n_parameters)
+
+        # Parametrized input states, built once and only bound afterwards
+        self._states = self._construct_states()
+        self._binder = ParameterBinder(self.ansatz)
+
+        # Energy evaluator of every input state, all of them are sent to the
+        # backend in one submission
+        self._energy_evaluator = SubspaceExpectationEvaluator(
+            hamiltonian=self.hamiltonian, backend=self.backend, circuits=self._states
+        )
+
+        # Parameter-shift rule for the gradient of the cost function
+        self._gradient_engine = None
+        if gradient_method == "param_shift":
+            self._gradient_engine = ParameterShiftGradient(self.ansatz)
+
         # Running inate functions
         self._inate_optimizer_run()
 
@@ -81,13 +204,10 @@ class SSVQE(object):
 
     def _apply_initialization(self, list_states: list) -> None:
 
+        # The most significant bit of the index is the first qubit
         for ind, state in enumerate(list_states):
-            b = bin(ind)[2:]
-            if len(b) != self.n_qubits:
-                b = "0" * (self.n_qubits - len(b)) + b
-            spl = textwrap.wrap(b, 1)
-            for qubit, val in enumerate(spl):
-                if val == "1":
+            for qubit in range(self.n_qubits):
+                if (ind >> (self.n_qubits - 1 - qubit)) & 1:
                     state.x(qubit)
 
     @property
@@ -103,25 +223,7 @@ class SSVQE(object):
         """Get an hardware-efficient ansatz for n_qubits
         given parameters.
         """
-
-        # Define variational Form
-        var_form = ansatz
-
-        # Get Parameters from the variational form
-        var_form_params = sorted(var_form.parameters, key=lambda p: p.name)
-
-        # Check if the number of parameters is compatible
-        assert len(var_form_params) == len(
-            params
-        ), "The number of parameters don't match"
-
-        # Create a dictionary with the parameters and values
-        param_dict = dict(zip(var_form_params, params))
-
-        # Assing those values for the ansatz
-        wave_function = var_form.assign_parameters(param_dict)
-
-        return wave_function
+        return ParameterBinder(ansatz).bind(params)
 
     def _apply_ansatz(self, list_states: list, name: str = None) -> None:
         for states in list_states:
@@ -147,53 +249,131 @@ class SSVQE(object):
         Returns:
             float: Cost function value.
         """
+        if self.profiler is not None:
+            self.profiler.start()
 
-        # Construct states
-        states = self._construct_states()
+        with recording(self.profiler, "energy"):
+            # Weighted hamiltonian of every input state
+            cost = _weighted_energy(self._energy_evaluator, params)
 
-        cost = 0
+        self._result.record(0, cost, np.nan, np.nan)
 
-        w = np.arange(len(states), 0, -1)
+        if self.profiler is not None:
+            self.profiler.stop(kind="cost", cost=float(cost))
 
-        for i, state in enumerate(states):
-            qc = self._apply_varform_params(state, params)
+        return cost
 
-            # Hamiltonian
-            hamiltonian_eval = sample_hamiltonian(
-                hamiltonian=self.hamiltonian, ansatz=qc, backend=self.backend
+    def _gradient_1(self, params: list) -> np.array:
+        """Evaluate the gradient of the first cost function of SSVQE with the
+        parameter-shift rule, evaluating all the shifted parameters and input
+        states in one batch.
+
+        Args:
+            params (list): Parameter values for the ansatz.
+
+        Returns:
+            np.array: Gradient of the cost function.
+        """
+        if self.profiler is not None:
+            self.profiler.start()
+
+        with recording(self.profiler, "energy"):
+            gradient = _weighted_gradient(
+                self._energy_evaluator, self._gradient_engine, params
             )
 
-            cost += w[i] * hamiltonian_eval
+        if self.profiler is not None:
+            self.profiler.stop(kind="gradient")
 
-        return cost
+        return gradient
 
-    def _inate_optimizer_run(self):
+    @property
+    def multistart_statistics(self) -> dict:
+        """Returns the statistics of the starts of the first optimization.
 
-        # Random initialization
-        params = np.random.rand(self.n_parameters)
+        Returns:
+            dict: Statistics of the starts, see utils.multistart_statistics.
+        """
+        return self._multistart
 
-        optimal_params, energy, n_iters = self.optimizer.optimize(
+    def _objective(self, params: list) -> float:
+        """First cost function given to the optimizer, cached if there is a cache."""
+        if self.cost_cache is None:
+            return self._cost_function_1(params)
+        return self.cost_cache.get_or_evaluate(self._cost_function_1, params)
+
+    def _optimize(self, initial_point: np.array) -> (np.array, float, int):
+        """Minimizes the first cost function from an initial point.
+
+        Args:
+            initial_point (np.array): Initial parameters.
+
+        Returns:
+            np.array: Optimal parameters.
+            float: Optimal value of the cost function.
+            int: Number of iterations.
+        """
+        return self.optimizer.optimize(
             num_vars=self.n_parameters,
-            objective_function=self._cost_function_1,
-            initial_point=params,
+            objective_function=self._objective,
+            gradient_function=self._gradient_1
+            if self._gradient_engine is not None
+            else None,
+            initial_point=initial_point,
         )
 
+    def _worker_settings(self) -> dict:
+        """Picklable settings that rebuild the first cost function on a worker
+        process, without the profiler, cache or traces."""
+        return {
+            "hamiltonian": self.hamiltonian,
+            "ansatz": self.ansatz,
+            "states": self._states,
+            "optimizer": self.optimizer,
+            "backend": backend_config(self.backend),
+            "gradient_method": self.gradient_method,
+        }
+
+    def _inate_optimizer_run(self):
+
+        # Random initialization
+        rng = np.random if self.seed is None else np.random.RandomState(self.seed)
+        initial_points = rng.rand(self.n_starts, self.n_parameters)
+
+        if self.n_jobs == 1 or len(initial_points) <= 1:
+            results = [self._optimize(point) for point in initial_points]
+        else:
+            worker = partial(_optimize_subspace_start, self._worker_settings())
+            results = parallel_map(worker, initial_points, self.n_jobs)
+
+        self._multistart = multistart_statistics(initial_points, results)
+
+        optimal_params, _, _ = results[self._multistart["best"]]
+
         self._ansatz_1_params = optimal_params
         self._first_optimization = True
 
-    def _cost_excited_state(self, ind: int, params: list):
-        cost = 0
-        # Construct states
-        states = self._construct_states()
+        # Every state of the subspace shares the optimal parameters
+        energies = self._energy_evaluator.evaluate(optimal_params)
+        for i, energy in enumerate(energies):
+            self._result.add_state(i, optimal_params, energy)
 
+    @property
+    def result(self) -> RunResult:
+        """Returns the results of the subspace optimization, with the energy of
+        each input state and the trace of the weighted cost.
+
+        Returns:
+            RunResult: Results of the run.
+        """
+        return self._result
+
+    def _cost_excited_state(self, ind: int, params: list):
         # Define Ansatz
-        qc = self._apply_varform_params(states[ind], params)
+        qc = self._binder.bind(params, self._states[ind])
 
-        # Hamiltonian
-        hamiltonian_eval = sample_hamiltonian(
-            hamiltonian=self.hamiltonian, ansatz=qc, backend=self.backend
-        )
-        cost += hamiltonian_eval
+        # Energy evaluated at the optimal parameters of the subspace
+        cost = self._result.state_energies[ind]
 
         return cost, qc
 
@@ -0,0 +1,329 @@
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+
+import numpy as np
+
+from typing import Union
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter, ParameterExpression
+from qiskit.circuit.exceptions import CircuitError
+from qiskit.opflow import OperatorBase
+
+from volta.ansatz import ParameterBinder
+from volta.counts import parity
+from volta.paulis import PauliSum
+
+
+def _rx(theta: float) -> np.array:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]])
+
+
+def _ry(theta: float) -> np.array:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz(theta: float) -> np.array:
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+
+def _phase(lam: float) -> np.array:
+    return np.diag([1.0, np.exp(1j * lam)])
+
+
+def _u3(theta: float, phi: float, lam: float) -> np.array:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array(
+        [
+            [c, -np.exp(1j * lam) * s],
+            [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c],
+        ]
+    )
+
+
+def _u2(phi: float, lam: float) -> np.array:
+    return _u3(np.pi / 2, phi, lam)
+
+
+def _rzz(theta: float) -> np.array:
+    a, b = np.exp(-0.5j * theta), np.exp(0.5j * theta)
+    return np.diag([a, b, b, a])
+
+
+def _controlled(matrix: np.array) -> np.array:
+    """Controlled version of a single qubit gate, the control is the first qubit."""
+    c_matrix = np.eye(4, dtype=complex)
+    c_matrix[np.ix_([1, 3], [1, 3])] = matrix
+    return c_matrix
+
+
+# Parametrized gates with a closed form matrix
+_PARAMETRIZED_GATES = {
+    "rx": _rx,
+    "ry": _ry,
+    "rz": _rz,
+    "p": _phase,
+    "u1": _phase,
+    "u2": _u2,
+    "u3": _u3,
+    "u": _u3,
+    "rzz": _rzz,
+    "crx": lambda theta: _controlled(_rx(theta)),
+    "cry": lambda theta: _controlled(_ry(theta)),
+    "crz": lambda theta: _controlled(_rz(theta)),
+    "cp": lambda lam: _controlled(_phase(lam)),
+    "cu1": lambda lam: _controlled(_phase(lam)),
+}
+
+# Instructions that do not act on the state
+_SKIPPED_INSTRUCTIONS = ["barrier", "delay"]
+
+
+def _flatten(
+    circuit: QuantumCircuit, qubits: list, parameter_index: dict, ops: list
+) -> None:
+    """Flatten a circuit into a list of gates that can be applied on a
+    statevector.
+
+    Each gate is stored as (qubits, matrix) if it is constant or as
+    (qubits, matrix function, angles, name) if it depends on the parameters,
+    where the angles are floats, parameter indices or parameter expressions.
+    """
+    qubit_map = dict(zip(circuit.qubits, qubits))
+
+    for instruction, qargs, _ in circuit.data:
+        inst_qubits = tuple(qubit_map[q] for q in qargs)
+
+        if instruction.name in _SKIPPED_INSTRUCTIONS:
+            continue
+
+        is_parametrized = any(
+            isinstance(p, ParameterExpression) and len(p.parameters) > 0
+            for p in instruction.params
+        )
+
+        if is_parametrized and instruction.name in _PARAMETRIZED_GATES:
+            angles = []
+            for p in instruction.params:
+                if isinstance(p, Parameter):
+                    angles.append(parameter_index[p])
+                elif isinstance(p, ParameterExpression) and len(p.parameters) > 0:
+                    angles.append(p)
+                else:
+                    angles.append(float(p))
+            ops.append(
+                (
+                    inst_qubits,
+                    _PARAMETRIZED_GATES[instruction.name],
+                    angles,
+                    instruction.name,
+                )
+            )
+            continue
+
+        if not is_parametrized and hasattr(instruction, "to_matrix"):
+            try:
+                matrix = np.asarray(instruction.to_matrix(), dtype=complex)
+                ops.append((inst_qubits, matrix))
+                continue
+            except CircuitError:
+                pass
+
+        if instruction.definition is None:
+            raise NotImplementedError(
+                f"Instruction {instruction.name} can not be simulated on the statevector."
+            )
+
+        _flatten(instruction.definition, inst_qubits, parameter_index, ops)
+
+
+def _apply_gate(psi: np.array, matrix: np.array, qubits: tuple) -> np.array:
+    """Apply a gate on a statevector using qiskit's qubit ordering."""
+    n_qubits = int(np.log2(psi.size))
+
+    if len(qubits) == 1:
+        q = qubits[0]
+        psi = psi.reshape(2 ** (n_qubits - 1 - q), 2, 2**q)
+        return (matrix @ psi).reshape(-1)
+
+    k = len(qubits)
+    axes = [n_qubits - 1 - q for q in reversed(qubits)]
+    psi = np.tensordot(
+        matrix.reshape([2] * 2 * k),
+        psi.reshape([2] * n_qubits),
+        (range(k, 2 * k), axes),
+    )
+    return np.moveaxis(psi, range(k), axes).reshape(-1)
+
+
+class CompiledAnsatz(object):
+    """Parametrized circuit compiled into a list of NumPy gates, so the
+    statevector can be simulated without qiskit objects in the inner loop.
+    """
+
+    def __init__(self, ansatz: QuantumCircuit) -> None:
+        """Initialize the class.
+
+        Args:
+            ansatz (QuantumCircuit): Parametrized quantum circuit.
+        """
+        self.ansatz = ansatz
+        self.n_qubits = ansatz.num_qubits
+
+        self._parameters = ParameterBinder(ansatz).parameters
+        self._parameter_index = {p: i for i, p in enumerate(self._parameters)}
+
+        self._ops = []
+        _flatten(ansatz, list(range(self.n_qubits)), self._parameter_index, self._ops)
+
+    @property
+    def num_parameters(self) -> int:
+        """Returns the number of free parameters of the ansatz.
+
+        Returns:
+            int: Number of parameters.
+        """
+        return len(self._parameters)
+
+    @property
+    def parametrized_gates(self) -> list:
+        """Returns the name and angles of the gates that depend on the
+        parameters, where the angles are floats, parameter indices or
+        parameter expressions.
+
+        Returns:
+            list: List of (name, angles) tuples.
+        """
+        return [(op[3], op[2]) for op in self._ops if len(op) == 4]
+
+    def _angle(self, angle: Union[float, int, ParameterExpression], params) -> float:
+        """Value of an angle given the parameter values."""
+        if isinstance(angle, ParameterExpression):
+            values = {p: params[self._parameter_index[p]] for p in angle.parameters}
+            return float(angle.bind(values))
+        if isinstance(angle, int):
+            return params[angle]
+        return angle
+
+    def statevector(self, params: Union[list, np.array]) -> np.array:
+        """Simulates the statevector for the given parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the ansatz.
+
+        Returns:
+            np.array: Statevector with qiskit's qubit ordering.
+        """
+        # Check if the number of parameters is compatible
+        assert len(self._parameters) == len(
+            params
+        ), "The number of parameters don't match"
+
+        psi = np.zeros(2**self.n_qubits, dtype=complex)
+        psi[0] = 1.0
+
+        for op in self._ops:
+            if len(op) == 2:
+                qubits, matrix = op
+            else:
+                qubits, gate, angles, _ = op
+                matrix = gate(*[self._angle(a, params) for a in angles])
+            psi = _apply_gate(psi, matrix, qubits)
+
+        return psi
+
+
+class ExactExpectationEvaluator(object):
+    """Evaluates the exact expected value of a hamiltonian for a parametrized
+    ansatz using a NumPy statevector.
+
+    The Pauli terms are applied with bit flips and phase masks: terms that
+    share the same X mask are merged into a single diagonal, so each
+    evaluation costs one gather per distinct X mask.
+    """
+
+    def __init__(
+        self, hamiltonian: Union[OperatorBase, PauliSum], ansatz: QuantumCircuit
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            hamiltonian (Union[OperatorBase, PauliSum]): Hamiltonian made of Pauli operators.
+            ansatz (QuantumCircuit): Parametrized quantum circuit for the state.
+        """
+        self.hamiltonian = hamiltonian
+        self.ansatz = ansatz
+        self._compiled = CompiledAnsatz(ansatz)
+
+        paulis = PauliSum.from_operator(hamiltonian).simplify()
+        x_masks, z_masks, coeffs = paulis.x_masks(), paulis.z_masks(), paulis.coeffs
+
+        self._indices = np.arange(2**ansatz.num_qubits, dtype=np.int64)
+
+        # Y = iXZ on each qubit
+        phases = np.array([1, 1j, -1, -1j])[paulis.num_y() % 4]
+
+        self._flips = np.unique(x_masks)
+        self._diagonals = []
+        for x in self._flips:
+            diagonal = np.zeros(len(self._indices), dtype=complex)
+            for z, coeff in zip(z_masks[x_masks == x], (coeffs * phases)[x_masks == x]):
+                diagonal += coeff * (1 - 2 * parity(self._indices & z))
+            self._diagonals.append(diagonal)
+
+    @property
+    def num_parameters(self) -> int:
+        """Returns the number of free parameters of the ansatz.
+
+        Returns:
+            int: Number of parameters.
+        """
+        return self._compiled.num_parameters
+
+    def expectation(self, psi: np.array) -> float:
+        """Expected value of the hamiltonian for a statevector.
+
+        Args:
+            psi (np.array): Statevector.
+
+        Returns:
+            float: Expected value
+        """
+        value = 0.0
+        for x, diagonal in zip(self._flips, self._diagonals):
+            value += np.vdot(psi[self._indices ^ x], diagonal * psi)
+        return np.real(value)
+
+    def evaluate(self, params: Union[list, np.array]) -> float:
+        """Evaluates the expected value for the given parameter values.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the ansatz.
+
+        Returns:
+            float: Expected value
+        """
+        return self.expectation(self._compiled.statevector(params))
+
+    def evaluate_batch(self, params_batch: np.array) -> np.array:
+        """Evaluates the expected value for many parameter vectors.
+
+        Args:
+            params_batch (np.array): Parameter values with shape (B, n_params).
+
+        Returns:
+            np.array: Expected values with shape (B,).
+        """
+        params_batch = np.atleast_2d(np.asarray(params_batch, dtype=float))
+        return np.array([self.evaluate(params) for params in params_batch])
+
+    def __call__(self, params: Union[list, np.array]) -> float:
+        return self.evaluate(params)
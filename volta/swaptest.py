@@ -7,13 +7,27 @@
 # that they have been altered from the originals.
 
 
+import os
 import qiskit
+import numpy as np
+from scipy.stats import norm
 from qiskit import QuantumCircuit, execute
 from qiskit.utils import QuantumInstance
 from qiskit.providers import BaseBackend
 
 from typing import Union
-import textwrap
+
+from volta.counts import (
+    counts_to_arrays,
+    swap_test_fidelity,
+    dswap_test_fidelity,
+    amplitude_transition_fidelity,
+    dswap_test_values,
+    wilson_half_width,
+)
+from volta.ansatz import ParameterBinder
+from volta.profiling import timed
+from volta.utils import get_counts, transpile_circuits
 
 
 def swap_test_circuit(qc1: QuantumCircuit, qc2: QuantumCircuit) -> QuantumCircuit:
@@ -77,15 +91,7 @@ def measure_swap_test(
             .get_counts()
         )
 
-    if "0" not in count:
-        count["0"] = 0
-    if "1" not in count:
-        count["1"] = 0
-
-    total_counts = count["0"] + count["1"]
-    fid_meas = count["0"]
-    p_0 = fid_meas / total_counts
-    return 2 * (p_0 - 1 / 2)
+    return swap_test_fidelity(*counts_to_arrays(count))
 
 
 def dswap_test_circuit(qc1: QuantumCircuit, qc2: QuantumCircuit) -> QuantumCircuit:
@@ -151,18 +157,7 @@ def measure_dswap_test(
             .get_counts()
         )
 
-    result = 0
-    for meas, counts in count.items():
-        split_meas = textwrap.wrap(meas, 2)
-        for m in split_meas:
-            if m == "11":
-                result -= counts
-            else:
-                result += counts
-
-    total = sum(count.values())
-
-    return result / (n * total)
+    return dswap_test_fidelity(*counts_to_arrays(count), n)
 
 
 def amplitude_transition_test_circuit(
@@ -216,10 +211,440 @@ def measure_amplitude_transition_test(
             .get_counts()
         )
 
-    if "0" * qc1.num_qubits not in count:
-        count["0" * qc1.num_qubits] = 0
+    return amplitude_transition_fidelity(*counts_to_arrays(count))
+
+
+# Circuit constructors for each state overlap method
+OVERLAP_CIRCUITS = {
+    "swap": swap_test_circuit,
+    "dswap": dswap_test_circuit,
+    "amplitude": amplitude_transition_test_circuit,
+}
+
+
+def overlap_from_counts(method: str, count: dict, n_qubits: int) -> float:
+    """Returns the fidelity from the counts of an overlap circuit.
+
+    Args:
+        method (str): State overlap method, one of swap, dswap and amplitude.
+        count (dict): Counts of the overlap circuit.
+        n_qubits (int): Number of qubits of each state.
+
+    Returns:
+        float: result of the overlap betweeen the two states.
+    """
+    outcomes, weights = counts_to_arrays(count)
+    if method == "swap":
+        return swap_test_fidelity(outcomes, weights)
+    if method == "dswap":
+        return dswap_test_fidelity(outcomes, weights, n_qubits)
+    if method == "amplitude":
+        return amplitude_transition_fidelity(outcomes, weights)
+    raise NotImplementedError(
+        f"overlapping method not implemented. Available implementing methods: {list(OVERLAP_CIRCUITS)}"
+    )
+
+
+def measure_overlaps(
+    pairs: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    method: str = "swap",
+    num_shots: int = 10000,
+) -> np.array:
+    """Returns the fidelities of many pairs of states, all the overlap circuits
+    are sent to the backend in a single submission.
+
+    Args:
+        pairs (list): List of (qc1, qc2) tuples of Quantum Circuits.
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        method (str, optional): State overlap method, one of swap, dswap and amplitude.
+        Defaults to swap.
+        num_shots (int, optional): Number of shots. Defaults to 10000.
+
+    Returns:
+        np.array: overlap of each pair of states.
+    """
+    if method not in OVERLAP_CIRCUITS:
+        raise NotImplementedError(
+            f"overlapping method not implemented. Available implementing methods: {list(OVERLAP_CIRCUITS)}"
+        )
+
+    if len(pairs) == 0:
+        return np.zeros(0)
+
+    with timed("construction"):
+        circuits = [OVERLAP_CIRCUITS[method](qc1, qc2) for qc1, qc2 in pairs]
+    counts = get_counts(circuits, backend, num_shots)
+
+    with timed("post_processing"):
+        return np.array(
+            [
+                overlap_from_counts(method, count, qc1.num_qubits)
+                for (qc1, _), count in zip(pairs, counts)
+            ]
+        )
+
+
+def overlap_matrix(
+    circuits: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    method: str = "swap",
+    num_shots: int = 10000,
+) -> np.array:
+    """Returns the matrix of fidelities between all pairs of states.
+
+    The fidelity is symmetric and equal to one on the diagonal, so only the
+    K(K-1)/2 overlap circuits of the upper triangle are built and sent to
+    the backend in a single submission.
+
+    Args:
+        circuits (list): List of K Quantum Circuits.
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        method (str, optional): State overlap method, one of swap, dswap and amplitude.
+        Defaults to swap.
+        num_shots (int, optional): Number of shots. Defaults to 10000.
+
+    Returns:
+        np.array: K x K matrix of fidelities.
+    """
+    n_circuits = len(circuits)
+    rows, cols = np.triu_indices(n_circuits, k=1)
+
+    fidelities = measure_overlaps(
+        [(circuits[i], circuits[j]) for i, j in zip(rows, cols)],
+        backend,
+        method,
+        num_shots,
+    )
+
+    matrix = np.eye(n_circuits)
+    matrix[rows, cols] = fidelities
+    matrix[cols, rows] = fidelities
+    return matrix
+
+
+class OverlapTemplate(object):
+    """Overlap circuit between a parametrized ansatz and a fixed reference
+    state, built and transpiled once for the backend.
+
+    The free parameters of the ansatz are kept on the transpiled circuit, so
+    each evaluation only binds new values.
+    """
+
+    def __init__(
+        self,
+        ansatz: QuantumCircuit,
+        reference: QuantumCircuit,
+        backend: Union[BaseBackend, QuantumInstance],
+        method: str = "swap",
+    ) -> None:
+        """Initialize the class.
+
+        Args:
+            ansatz (QuantumCircuit): Parametrized quantum circuit for the first state.
+            reference (QuantumCircuit): Quantum circuit for the second state.
+            backend (Union[BaseBackend,QuantumInstance]): Backend.
+            method (str, optional): State overlap method, one of swap, dswap and amplitude.
+            Defaults to swap.
+        """
+        if method not in OVERLAP_CIRCUITS:
+            raise NotImplementedError(
+                f"overlapping method not implemented. Available implementing methods: {list(OVERLAP_CIRCUITS)}"
+            )
+
+        self.method = method
+        self.n_qubits = ansatz.num_qubits
+
+        self._binder = ParameterBinder(ansatz)
+
+        with timed("construction"):
+            circuit = OVERLAP_CIRCUITS[method](ansatz, reference)
+        self.circuit = transpile_circuits([circuit], backend)[0]
+
+    def bind(self, params: Union[list, np.array]) -> QuantumCircuit:
+        """Binds the parameters to the transpiled overlap circuit.
+
+        Args:
+            params (Union[list, np.array]): Parameter values for the ansatz.
+
+        Returns:
+            QuantumCircuit: Transpiled overlap circuit.
+        """
+        return self._binder.bind(params, self.circuit)
+
+
+def measure_overlap_templates(
+    templates: list,
+    params_batch: np.array,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: int = 10000,
+    tolerance: float = None,
+    confidence: float = 0.95,
+    chunk_shots: int = 1000,
+) -> np.array:
+    """Returns the fidelities of every template for each parameter vector, all
+    the bound circuits are sent to the backend in a single submission without
+    transpiling them again.
+
+    If a tolerance is given, the shots are sent in chunks and each circuit
+    stops as soon as its fidelity is known within the tolerance, using at most
+    num_shots.
+
+    Args:
+        templates (list): List of OverlapTemplate built for the backend.
+        params_batch (np.array): Parameter values with shape (B, n_params).
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        num_shots (int, optional): Number of shots. Defaults to 10000.
+        tolerance (float, optional): Half width of the confidence interval to stop.
+        Defaults to None.
+        confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+        chunk_shots (int, optional): Number of shots of each chunk. Defaults to 1000.
+
+    Returns:
+        np.array: Fidelities with shape (B, n_templates).
+    """
+    if len(templates) == 0 or len(params_batch) == 0:
+        return np.zeros((len(params_batch), len(templates)))
+
+    circuits = [
+        template.bind(params) for params in params_batch for template in templates
+    ]
+    if tolerance is not None:
+        fidelities, _, _ = _measure_sequential(
+            circuits,
+            [template.method for template in templates] * len(params_batch),
+            [template.n_qubits for template in templates] * len(params_batch),
+            backend,
+            tolerance,
+            confidence,
+            chunk_shots,
+            num_shots,
+        )
+        return fidelities.reshape(len(params_batch), len(templates))
+
+    counts = get_counts(circuits, backend, num_shots, transpiled=True)
+
+    with timed("post_processing"):
+        fidelities = [
+            overlap_from_counts(template.method, count, template.n_qubits)
+            for template, count in zip(templates * len(params_batch), counts)
+        ]
+        return np.array(fidelities).reshape(len(params_batch), len(templates))
+
+
+def _overlap_interval(
+    method: str, outcomes: np.array, weights: np.array, n_qubits: int, z: float
+) -> (float, float):
+    """Fidelity and half width of its confidence interval from the outcomes of
+    an overlap circuit: Wilson score for the swap and amplitude tests and the
+    normal approximation for the destructive swap test."""
+    n_shots = weights.sum()
+
+    if method == "swap":
+        p_0 = weights[(outcomes & 1) == 0].sum() / n_shots
+        return 2 * p_0 - 1, 2 * wilson_half_width(p_0, n_shots, z)
+
+    if method == "amplitude":
+        p_0 = weights[outcomes == 0].sum() / n_shots
+        return p_0, wilson_half_width(p_0, n_shots, z)
+
+    values = dswap_test_values(outcomes, n_qubits)
+    fidelity = values @ weights / n_shots
+    variance = (values - fidelity) ** 2 @ weights / max(n_shots - 1, 1)
+    return fidelity, z * np.sqrt(variance / n_shots)
+
+
+def _measure_sequential(
+    circuits: list,
+    methods: list,
+    n_qubits: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    tolerance: float,
+    confidence: float,
+    chunk_shots: int,
+    max_shots: int,
+) -> (np.array, np.array, np.array):
+    """Runs transpiled overlap circuits in chunks of shots until the half
+    width of every confidence interval is below the tolerance, each chunk of
+    the circuits that did not converge is sent in a single submission."""
+    z = norm.ppf((1 + confidence) / 2)
+
+    n_circuits = len(circuits)
+    outcomes = [np.zeros(0, dtype=np.int64) for _ in range(n_circuits)]
+    weights = [np.zeros(0) for _ in range(n_circuits)]
+    fidelities = np.zeros(n_circuits)
+    half_widths = np.full(n_circuits, np.inf)
+    shots_used = np.zeros(n_circuits, dtype=int)
+
+    active = np.arange(n_circuits)
+    while len(active) > 0:
+        num_shots = np.minimum(chunk_shots, max_shots - shots_used[active])
+        counts = get_counts(
+            [circuits[i] for i in active], backend, num_shots, transpiled=True
+        )
+
+        with timed("post_processing"):
+            for i, shots, count in zip(active, num_shots, counts):
+                chunk_outcomes, chunk_weights = counts_to_arrays(count)
+                outcomes[i] = np.concatenate([outcomes[i], chunk_outcomes])
+                weights[i] = np.concatenate([weights[i], chunk_weights])
+                shots_used[i] += shots
+
+                fidelities[i], half_widths[i] = _overlap_interval(
+                    methods[i], outcomes[i], weights[i], n_qubits[i], z
+                )
+
+        active = active[
+            (half_widths[active] > tolerance) & (shots_used[active] < max_shots)
+        ]
+
+    return fidelities, half_widths, shots_used
+
+
+def measure_overlap_sequential(
+    qc1: QuantumCircuit,
+    qc2: QuantumCircuit,
+    backend: Union[BaseBackend, QuantumInstance],
+    method: str = "swap",
+    tolerance: float = 0.01,
+    confidence: float = 0.95,
+    chunk_shots: int = 1000,
+    max_shots: int = 10000,
+) -> (float, float, int):
+    """Returns the fidelity between two states, running the overlap circuit
+    in chunks of shots and stopping as soon as the fidelity is known within
+    the tolerance.
+
+    Args:
+        qc1 (QuantumCircuit): Quantum Circuit for the first state.
+        qc2 (QuantumCircuit): Quantum Circuit for the second state.
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        method (str, optional): State overlap method, one of swap, dswap and amplitude.
+        Defaults to swap.
+        tolerance (float, optional): Half width of the confidence interval to stop.
+        Defaults to 0.01.
+        confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+        chunk_shots (int, optional): Number of shots of each chunk. Defaults to 1000.
+        max_shots (int, optional): Maximum number of shots. Defaults to 10000.
+
+    Returns:
+        float: result of the overlap betweeen the first and second state.
+        float: half width of the confidence interval.
+        int: number of shots used.
+    """
+    template = OverlapTemplate(qc1, qc2, backend, method)
+    fidelities, half_widths, shots_used = _measure_sequential(
+        [template.bind([])],
+        [method],
+        [qc1.num_qubits],
+        backend,
+        tolerance,
+        confidence,
+        chunk_shots,
+        max_shots,
+    )
+    return fidelities[0], half_widths[0], shots_used[0]
+
+
+# Upper bound on the standard deviation of a single shot fidelity estimate,
+# over all the states, it does not depend on the ansatz
+_SHOT_STD = {"swap": 1.0, "dswap": 1.0, "amplitude": 0.5}
+
+
+def _available_memory() -> float:
+    """Physical memory of the machine in bytes, infinite if unknown."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return np.inf
+
+
+def overlap_costs(
+    ansatz: QuantumCircuit,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: int = 10000,
+) -> dict:
+    """Estimates the cost of each overlap method for an ansatz on a backend.
+
+    For each method it reports the width of the circuit, the memory of a
+    complex statevector simulation of that width (zero on devices), the depth
+    of the decomposed circuit, the worst case standard deviation of the
+    fidelity with the number of shots, if the circuit fits on the backend and
+    the memory of the machine, and a cost used to rank the methods: memory
+    times depth on simulators and depth on devices.
+
+    The standard deviation is an upper bound over all the states, not an
+    estimate for the actual ansatz, so it only separates the methods when the
+    number of shots is small for the precision.
+
+    Args:
+        ansatz (QuantumCircuit): Quantum circuit for the states.
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        num_shots (int, optional): Number of shots, only used if the backend is not a
+        quantum instance, which runs with its own shots. Defaults to 10000.
+
+    Returns:
+        dict: Dictionary with the estimates of each method.
+    """
+    # Check if the backend is a quantum instance.
+    if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
+        configuration = backend.backend.configuration()
+        num_shots = backend.run_config.shots
+    else:
+        configuration = backend.configuration()
+
+    is_simulator = configuration.simulator
+    max_qubits = getattr(configuration, "n_qubits", None) or np.inf
+    available_memory = _available_memory()
+
+    costs = {}
+    for method, build_circuit in OVERLAP_CIRCUITS.items():
+        circuit = build_circuit(ansatz, ansatz)
+        width = circuit.num_qubits
+        memory = 16 * 2**width if is_simulator else 0
+        depth = circuit.decompose().depth()
+
+        costs[method] = {
+            "width": width,
+            "memory": memory,
+            "depth": depth,
+            "std": _SHOT_STD[method] / np.sqrt(num_shots),
+            "fits": width <= max_qubits and memory <= available_memory,
+            "cost": memory * depth if is_simulator else depth,
+        }
+
+    return costs
+
+
+def choose_overlap_method(
+    ansatz: QuantumCircuit,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: int = 10000,
+    precision: float = 0.01,
+) -> (str, dict):
+    """Chooses the cheapest overlap method that fits on the backend and
+    reaches the precision, or the most precise one that fits if none does.
+
+    Args:
+        ansatz (QuantumCircuit): Quantum circuit for the states.
+        backend (Union[BaseBackend,QuantumInstance]): Backend.
+        num_shots (int, optional): Number of shots, only used if the backend is not a
+        quantum instance. Defaults to 10000.
+        precision (float, optional): Target for the worst case standard deviation of
+        the fidelity. Defaults to 0.01.
+
+    Returns:
+        str: Name of the overlap method.
+        dict: Cost estimates of each method, see overlap_costs.
+    """
+    costs = overlap_costs(ansatz, backend, num_shots)
+
+    fitting = [method for method in costs if costs[method]["fits"]]
+    if len(fitting) == 0:
+        raise ValueError("No overlap method fits on the backend for this ansatz.")
+
+    precise = [method for method in fitting if costs[method]["std"] <= precision]
+    if len(precise) == 0:
+        return min(fitting, key=lambda m: costs[m]["std"]), costs
 
-    total_counts = sum(count.values())
-    fid_meas = count["0" * qc1.num_qubits]
-    p_0 = fid_meas / total_counts
-    return p_0
+    return min(precise, key=lambda m: (costs[m]["cost"], costs[m]["std"])), costs
@@ -7,8 +7,22 @@
 # that they have been altered from the originals.
 
 
+import os
+import asyncio
+import threading
+from contextlib import contextmanager
 import numpy as np
+import qiskit
+from qiskit import execute, assemble, transpile
 from qiskit.opflow import OperatorBase
+from qiskit.providers import BaseBackend
+from qiskit.utils import QuantumInstance
+from qiskit.utils.backend_utils import is_aer_provider, is_basicaer_provider
+
+from typing import Union, Callable
+
+from volta.profiling import timed, record_jobs
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 
 def classical_solver(hamiltonian: OperatorBase) -> (np.array, np.array):
@@ -29,3 +43,288 @@ def classical_solver(hamiltonian: OperatorBase) -> (np.array, np.array):
         raise Exception("Not able to get the eigenvalues.")
 
     return eigenvalues, eigenvectors
+
+
+# Serializes the submissions to quantum instances, which are not thread-safe
+_SUBMISSION_LOCK = threading.RLock()
+
+
+@contextmanager
+def submission_lock(backend: Union[BaseBackend, QuantumInstance]):
+    """Holds the submission lock if the backend is a quantum instance.
+
+    Quantum instances, and the circuit samplers built on them, change their
+    internal state on every submission, so submissions from different threads
+    are serialized. Other backends are not locked.
+
+    Args:
+        backend (Union[BaseBackend, QuantumInstance]): Backend of the submission.
+    """
+    if qiskit.utils.quantum_instance.QuantumInstance != type(backend):
+        yield
+        return
+
+    with _SUBMISSION_LOCK:
+        yield
+
+
+def _get_counts(
+    circuits: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: int,
+    set_instance_shots: bool,
+    transpiled: bool = False,
+) -> list:
+    """Runs a list of circuits in a single submission to the backend."""
+    is_instance = qiskit.utils.quantum_instance.QuantumInstance == type(backend)
+    if is_instance and not set_instance_shots:
+        num_shots = backend.run_config.shots
+
+    with timed("execution"):
+        result = _run_circuits(
+            circuits, backend, num_shots, set_instance_shots, transpiled
+        )
+    record_jobs(len(circuits), num_shots * len(circuits))
+
+    return [result.get_counts(i) for i in range(len(circuits))]
+
+
+def _run_circuits(
+    circuits: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: int,
+    set_instance_shots: bool,
+    transpiled: bool,
+) -> qiskit.result.Result:
+    """Submits a list of circuits to the backend and waits for the result."""
+    # Check if the backend is a quantum instance.
+    if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
+        with submission_lock(backend):
+            if not set_instance_shots:
+                result = backend.execute(circuits, had_transpiled=transpiled)
+            else:
+                instance_shots = backend.run_config.shots
+                backend.set_config(shots=num_shots)
+                try:
+                    result = backend.execute(circuits, had_transpiled=transpiled)
+                finally:
+                    backend.set_config(shots=instance_shots)
+    elif transpiled:
+        qobj = assemble(circuits, backend=backend, shots=num_shots)
+        result = backend.run(qobj).result()
+    else:
+        result = execute(circuits, backend=backend, shots=num_shots).result()
+
+    return result
+
+
+def get_counts(
+    circuits: list,
+    backend: Union[BaseBackend, QuantumInstance],
+    num_shots: Union[int, list] = 10000,
+    transpiled: bool = False,
+) -> list:
+    """Runs a list of circuits in a single submission to the backend.
+
+    Args:
+        circuits (list): Quantum circuits with measurements.
+        backend (Union[BaseBackend, QuantumInstance]): Backend.
+        num_shots (Union[int, list], optional): Number of shots, only used if the
+        backend is not a quantum instance. If a list is given, each circuit runs with
+        its own number of shots, which costs one submission for each distinct value.
+        Defaults to 10000.
+        transpiled (bool, optional): If the circuits were already transpiled for the
+        backend, they are sent without transpiling them again. Defaults to False.
+
+    Returns:
+        list: Counts for each circuit.
+    """
+    if np.ndim(num_shots) == 0:
+        return _get_counts(circuits, backend, int(num_shots), False, transpiled)
+
+    num_shots = np.asarray(num_shots)
+    counts = [None] * len(circuits)
+    for shots in np.unique(num_shots):
+        indices = np.flatnonzero(num_shots == shots)
+        shots_counts = _get_counts(
+            [circuits[i] for i in indices], backend, int(shots), True, transpiled
+        )
+        for i, count in zip(indices, shots_counts):
+            counts[i] = count
+
+    return counts
+
+
+def transpile_circuits(
+    circuits: list, backend: Union[BaseBackend, QuantumInstance]
+) -> list:
+    """Transpiles a list of circuits for the backend, keeping their free
+    parameters so they can be bound later.
+
+    Args:
+        circuits (list): Quantum circuits.
+        backend (Union[BaseBackend, QuantumInstance]): Backend.
+
+    Returns:
+        list: Transpiled circuits.
+    """
+    with timed("transpilation"):
+        # Check if the backend is a quantum instance.
+        if qiskit.utils.quantum_instance.QuantumInstance == type(backend):
+            return backend.transpile(circuits)
+        return transpile(circuits, backend=backend)
+
+
+def backend_config(backend: Union[BaseBackend, QuantumInstance]) -> dict:
+    """Picklable description of a simulator backend, so that worker processes
+    can rebuild it without pickling the backend or the quantum instance.
+
+    Args:
+        backend (Union[BaseBackend, QuantumInstance]): Aer or BasicAer simulator.
+
+    Returns:
+        dict: Provider, name and, for a quantum instance, shots and seeds.
+    """
+    is_instance = qiskit.utils.quantum_instance.QuantumInstance == type(backend)
+    simulator = backend.backend if is_instance else backend
+
+    if is_aer_provider(simulator):
+        provider = "aer"
+    elif is_basicaer_provider(simulator):
+        provider = "basicaer"
+    else:
+        raise ValueError(
+            "Only Aer and BasicAer simulators can run in a pool of processes."
+        )
+
+    config = {"provider": provider, "name": simulator.name(), "shots": None}
+    if is_instance:
+        config["shots"] = backend.run_config.shots
+        config["seed_simulator"] = getattr(backend.run_config, "seed_simulator", None)
+        config["seed_transpiler"] = backend.compile_config.get("seed_transpiler")
+    return config
+
+
+def backend_from_config(config: dict) -> Union[BaseBackend, QuantumInstance]:
+    """Rebuilds a simulator backend from its description.
+
+    Args:
+        config (dict): Description given by backend_config.
+
+    Returns:
+        Union[BaseBackend, QuantumInstance]: Simulator backend.
+    """
+    provider = qiskit.Aer if config["provider"] == "aer" else qiskit.BasicAer
+    backend = provider.get_backend(config["name"])
+    if config["shots"] is None:
+        return backend
+
+    return QuantumInstance(
+        backend=backend,
+        shots=config["shots"],
+        seed_simulator=config["seed_simulator"],
+        seed_transpiler=config["seed_transpiler"],
+    )
+
+
+def parallel_map(function: Callable, values: list, n_jobs: int = None) -> list:
+    """Applies a function to each value in a pool of processes.
+
+    Args:
+        function (Callable): Picklable function, such as a module-level function
+        with its arguments bound by functools.partial.
+        values (list): Values.
+        n_jobs (int, optional): Number of processes, if None it uses all the cores.
+        If 1 or if there is a single value, it runs on the current process.
+        Defaults to None.
+
+    Returns:
+        list: Result for each value, in the same order.
+    """
+    values = list(values)
+    if n_jobs == 1 or len(values) <= 1:
+        return [function(value) for value in values]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(function, values))
+
+
+def multistart_statistics(initial_points: np.array, results: list) -> dict:
+    """Collects the results of optimizations from many initial points.
+
+    Args:
+        initial_points (np.array): Initial points with shape (n_starts, n_params).
+        results (list): (optimal_params, value, n_iters) of each start.
+
+    Returns:
+        dict: Initial points, optimal parameters, optimal values, number of
+        iterations and index of the best start.
+    """
+    optimal_params, values, n_iters = zip(*results)
+    return {
+        "initial_points": np.asarray(initial_points),
+        "optimal_params": np.array(optimal_params),
+        "values": np.array(values, dtype=float),
+        "n_iters": np.array([np.nan if n is None else n for n in n_iters]),
+        "best": int(np.argmin(values)),
+    }
+
+
+def save_checkpoint(path: str, **arrays) -> None:
+    """Saves arrays to a npz file atomically, the file is written to a
+    temporary path and then replaces the previous checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint.
+        **arrays: Arrays to save.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """Loads the arrays of a npz checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint.
+
+    Returns:
+        dict: Arrays of the checkpoint.
+    """
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+async def gather_blocking(functions: list) -> list:
+    """Runs blocking functions on threads of the event loop's executor and
+    awaits them together.
+
+    Args:
+        functions (list): Functions without arguments.
+
+    Returns:
+        list: Result of each function, in the same order.
+    """
+    loop = asyncio.get_event_loop()
+    return await asyncio.gather(
+        *[loop.run_in_executor(None, function) for function in functions]
+    )
+
+
+def run_concurrently(functions: list) -> list:
+    """Runs blocking functions on threads and waits for all of them.
+
+    Args:
+        functions (list): Functions without arguments.
+
+    Returns:
+        list: Result of each function, in the same order.
+    """
+    if len(functions) <= 1:
+        return [function() for function in functions]
+
+    with ThreadPoolExecutor(max_workers=len(functions)) as executor:
+        futures = [executor.submit(function) for function in functions]
+        return [future.result() for future in futures]
@@ -10,6 +10,7 @@
 import numpy as np
 
 from typing import Union
+from functools import partial
 
 
 from qiskit import QuantumCircuit
@@ -19,11 +20,28 @@ from qiskit.aqua import QuantumInstance
 from qiskit.providers import BaseBackend
 
 
-from volta.observables import sample_hamiltonian
+from volta.utils import (
+    backend_config,
+    backend_from_config,
+    parallel_map,
+    multistart_statistics,
+    save_checkpoint,
+    load_checkpoint,
+    gather_blocking,
+    run_concurrently,
+)
+from volta.ansatz import ParameterBinder
+from volta.cache import CostCache
+from volta.profiling import Profiler, recording, timed
+from volta.results import RunResult
+from volta.observables import ExpectationEvaluator
+from volta.grouping import GroupedExpectationEvaluator
+from volta.gradients import ParameterShiftGradient
+from volta.statevector import CompiledAnsatz
 from volta.swaptest import (
-    measure_swap_test,
-    measure_dswap_test,
-    measure_amplitude_transition_test,
+    OverlapTemplate,
+    choose_overlap_method,
+    measure_overlap_templates,
 )
 
 
@@ -44,6 +62,17 @@ class VQD(object):
         backend: Union[BaseBackend, QuantumInstance],
         overlap_method: str = "swap",
         num_shots: int = 10000,
+        shot_budget: int = None,
+        gradient_method: str = None,
+        overlap_tolerance: float = None,
+        n_starts: int = 1,
+        n_jobs: int = 1,
+        seed: int = None,
+        checkpoint_path: str = None,
+        checkpoint_interval: int = None,
+        concurrent_jobs: bool = False,
+        cost_cache: CostCache = None,
+        profiler: Profiler = None,
         debug: bool = False,
     ) -> None:
         """Initialize the class.
@@ -58,8 +87,41 @@ class VQD(object):
             optimizer (qiskit.algorithms.optimizers.Optimizer): Classical Optimizers
             from Terra.
             backend (Union[BaseBackend, QuantumInstance]): Backend for running the algorithm.
-            overlap_method (str): State overlap method. Methods available: swap, dswap, amplitude (Default: swap)
+            overlap_method (str): State overlap method. Methods available: swap, dswap, amplitude, exact.
+            The exact method simulates the statevectors with NumPy instead of running overlap
+            circuits. The auto method picks the cheapest of swap, dswap and amplitude that
+            fits on the backend, see swaptest.choose_overlap_method. (Default: swap)
             num_shots (int): Number of shots. (Default: 10000)
+            shot_budget (int): Total number of shots for each energy evaluation, spread
+            across qubit-wise commuting groups of the hamiltonian according to their
+            variance. If None, the energy is measured with opflow's expectation. (Default: None)
+            gradient_method (str): Gradient given to the optimizer. Methods available:
+            param_shift. If None, the optimizer uses its own gradient. (Default: None)
+            overlap_tolerance (float): If given, the overlaps are measured in chunks of shots
+            and stop once the fidelity is known within this tolerance, using at most
+            num_shots. It is also the target precision of the auto overlap method,
+            which defaults to 0.01. (Default: None)
+            n_starts (int): Number of optimizations from different random initial points for
+            each state, the best one is kept. (Default: 1)
+            n_jobs (int): Number of processes for the starts, if None it uses all the cores.
+            Each process rebuilds the algorithm from picklable settings, so the backend
+            must be an Aer or BasicAer simulator. (Default: 1)
+            seed (int): Seed for the initial points, the state i uses seed + i. If None, the
+            initial points come from numpy's global random state. (Default: None)
+            checkpoint_path (str): Path of a npz file where the optimal parameters and energies
+            are saved after each state, see resume. (Default: None)
+            checkpoint_interval (int): If given with a single start, the best parameters of the
+            current state are also saved every checkpoint_interval cost evaluations.
+            (Default: None)
+            concurrent_jobs (bool): If True, the energy and the overlaps of each cost evaluation
+            are submitted concurrently from threads and awaited together. Submissions to a
+            shared quantum instance are serialized, since it is not thread-safe, so only the
+            binding and post-processing overlap with the other job. (Default: False)
+            cost_cache (CostCache): Cache of the cost function values, cleared at the start of
+            each state. With many starts in a pool, each process uses its own copy. (Default: None)
+            profiler (Profiler): Records the timings, circuits and shots of each cost and gradient
+            evaluation, split between energy and overlaps. Starts running in a pool of processes
+            are not recorded. (Default: None)
         """
 
         # Input parameters
@@ -70,22 +132,88 @@ class VQD(object):
         self.NUM_SHOTS = num_shots
         self.BETA = beta
         self.overlap_method = overlap_method
-
-        IMPLEMENTED_OVERLAP_METHODS = ["swap", "dswap", "amplitude"]
+        self.overlap_tolerance = overlap_tolerance
+        self.shot_budget = shot_budget
+        self.gradient_method = gradient_method
+        self.n_starts = n_starts
+        self.n_jobs = n_jobs
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.concurrent_jobs = concurrent_jobs
+        self.cost_cache = cost_cache
+        self.profiler = profiler
+
+        IMPLEMENTED_OVERLAP_METHODS = ["swap", "dswap", "amplitude", "exact", "auto"]
         if self.overlap_method not in IMPLEMENTED_OVERLAP_METHODS:
             raise NotImplementedError(
                 f"overlapping method not implemented. Available implementing methods: {IMPLEMENTED_OVERLAP_METHODS}"
             )
 
+        # Cost estimates of the overlap methods, if chosen automatically
+        self.overlap_costs = None
+        if self.overlap_method == "auto":
+            self.overlap_method, self.overlap_costs = choose_overlap_method(
+                ansatz,
+                backend,
+                num_shots,
+                overlap_tolerance if overlap_tolerance is not None else 0.01,
+            )
+
+        IMPLEMENTED_GRADIENT_METHODS = ["param_shift"]
+        if (
+            gradient_method is not None
+            and gradient_method not in IMPLEMENTED_GRADIENT_METHODS
+        ):
+            raise NotImplementedError(
+                f"gradient method not implemented. Available implementing methods: {IMPLEMENTED_GRADIENT_METHODS}"
+            )
+
         # Helper Parameters
         self.n_excited_states = n_excited_states + 1
         self.ansatz = ansatz
+        self._binder = ParameterBinder(ansatz)
         self.n_parameters = self._get_num_parameters
         self._debug = debug
 
+        # Energy evaluator, built once for the parametrized ansatz
+        if shot_budget is None:
+            self._energy_evaluator = ExpectationEvaluator(
+                hamiltonian=self.hamiltonian, backend=self.backend, ansatz=self.ansatz
+            )
+        else:
+            self._energy_evaluator = GroupedExpectationEvaluator(
+                hamiltonian=self.hamiltonian,
+                backend=self.backend,
+                ansatz=self.ansatz,
+                shot_budget=shot_budget,
+            )
+
+        # Parameter-shift rule for the gradient of the cost function
+        self._gradient_engine = None
+        if gradient_method == "param_shift":
+            self._gradient_engine = ParameterShiftGradient(self.ansatz)
+
+        # Compiled ansatz for the exact overlaps
+        self._compiled_ansatz = None
+        if self.overlap_method == "exact":
+            self._compiled_ansatz = CompiledAnsatz(self.ansatz)
+
         # Logs
-        self._states = []
-        self._energies = []
+        self._result = RunResult(self.n_excited_states, self.n_parameters)
+        self._multistart = []
+
+        # Progress of the current state, for the checkpoints
+        self._n_evaluations = 0
+        self._current_params = None
+        self._current_cost = np.inf
+        self._resume_point = None
+
+        # Statevectors of the previous states, for the exact overlaps
+        self._statevectors = np.zeros((0, 2**self.n_qubits), dtype=complex)
+
+        # Transpiled overlap circuits with the previous states
+        self._overlap_templates = []
 
     @property
     def energies(self) -> list:
@@ -94,16 +222,27 @@ class VQD(object):
         Returns:
             list: list with energies
         """
-        return self._energies
+        return list(self._result.state_energies)
 
     @property
     def states(self) -> list:
-        """Returns a list with states associated with each energy.
+        """Returns a list with states associated with each energy, rebuilt
+        from the optimal parameters.
 
         Returns:
             list: list with states.
         """
-        return self._states
+        return self._binder.bind_batch(self._result.state_params)
+
+    @property
+    def result(self) -> RunResult:
+        """Returns the results of the run, with the energies sorted by value,
+        the optimal parameters and the per-evaluation traces.
+
+        Returns:
+            RunResult: Results of the run.
+        """
+        return self._result
 
     @property
     def _get_num_parameters(self) -> int:
@@ -118,25 +257,81 @@ class VQD(object):
         """Get an hardware-efficient ansatz for n_qubits
         given parameters.
         """
+        return self._binder.bind(params)
 
-        # Define variational Form
-        var_form = self.ansatz
+    def _fidelities(self, params_batch: np.array) -> np.array:
+        """Fidelities between the ansatz for each parameter vector and every
+        previous state, with shape (B, n_states).
 
-        # Get Parameters from the variational form
-        var_form_params = sorted(var_form.parameters, key=lambda p: p.name)
+        The exact method is one matrix product against the cached statevectors,
+        the other methods bind the transpiled overlap circuits and send them in
+        a single submission.
+        """
+        if self.overlap_method == "exact":
+            with timed("execution"):
+                psis = np.array(
+                    [
+                        self._compiled_ansatz.statevector(params)
+                        for params in params_batch
+                    ]
+                )
+            with timed("post_processing"):
+                return np.abs(psis @ self._statevectors.conj().T) ** 2
+
+        return measure_overlap_templates(
+            self._overlap_templates,
+            params_batch,
+            self.backend,
+            self.NUM_SHOTS,
+            tolerance=self.overlap_tolerance,
+        )
 
-        # Check if the number of parameters is compatible
-        assert len(var_form_params) == len(
-            params
-        ), "The number of parameters don't match"
+    def _cost_jobs(self, params: list) -> list:
+        """Blocking jobs of a cost evaluation: the energy and, if there are
+        previous states, the overlaps with all of them."""
+        jobs = [
+            partial(self._profiled, "energy", self._energy_evaluator.evaluate, params)
+        ]
+        if self._result.num_found != 0:
+            jobs.append(partial(self._profiled, "overlap", self._fidelities, [params]))
+        return jobs
+
+    def _profiled(self, part: str, function, *args):
+        """Calls a function recording its sections on a part of the profiler."""
+        with recording(self.profiler, part):
+            return function(*args)
+
+    def _cost_from_results(self, params: list, results: list) -> float:
+        """Combines the results of the cost jobs into the cost function."""
+        # Hamiltonian
+        hamiltonian_eval = results[0]
+
+        # Fidelity
+        fidelity = 0.0
+        if len(results) > 1:
+            fidelities = results[1][0]
+            fidelity = np.sum(fidelities)
+
+            if self._debug:
+                print(fidelities)
 
-        # Create a dictionary with the parameters and values
-        param_dict = dict(zip(var_form_params, params))
+        # Get the cost function
+        cost = hamiltonian_eval + self.BETA * fidelity
 
-        # Assing those values for the ansatz
-        wave_function = var_form.assign_parameters(param_dict)
+        self._track_progress(params, cost)
+        self._result.record(
+            self._result.num_found, cost, hamiltonian_eval, self.BETA * fidelity
+        )
+
+        if self.profiler is not None:
+            self.profiler.stop(
+                kind="cost",
+                state=self._result.num_found,
+                energy=float(hamiltonian_eval),
+                cost=float(cost),
+            )
 
-        return wave_function
+        return cost
 
     def cost_function(self, params: list) -> float:
         """Evaluate the cost function of VQD.
@@ -147,66 +342,329 @@ class VQD(object):
         Returns:
             float: Cost function value.
         """
-        # Define Ansatz
-        qc = self._apply_varform_params(params)
+        if self.profiler is not None:
+            self.profiler.start()
+
+        jobs = self._cost_jobs(params)
+
+        if self.concurrent_jobs:
+            results = run_concurrently(jobs)
+        else:
+            results = [job() for job in jobs]
+
+        return self._cost_from_results(params, results)
+
+    async def cost_function_async(self, params: list) -> float:
+        """Evaluate the cost function of VQD, submitting the energy and the
+        overlaps concurrently and awaiting them together.
+
+        Args:
+            params (list): Parameter values for the ansatz.
+
+        Returns:
+            float: Cost function value.
+        """
+        if self.profiler is not None:
+            self.profiler.start()
+
+        results = await gather_blocking(self._cost_jobs(params))
+        return self._cost_from_results(params, results)
+
+    def _track_progress(self, params: list, cost: float) -> None:
+        """Keeps the best parameters of the current state and saves them every
+        checkpoint_interval evaluations, only for a single start since the
+        starts of a pool run on other processes."""
+        self._n_evaluations += 1
+        if cost < self._current_cost:
+            self._current_cost = cost
+            self._current_params = np.array(params, dtype=float)
+
+        if (
+            self.checkpoint_path is not None
+            and self.checkpoint_interval is not None
+            and self.n_starts == 1
+            and self._n_evaluations % self.checkpoint_interval == 0
+        ):
+            self.save_checkpoint(self.checkpoint_path)
+
+    def save_checkpoint(self, path: str) -> None:
+        """Saves the optimal parameters and energies of the states found so far,
+        the best parameters of the current state, the optimizer setting and the
+        random state to a npz file. The optimizer setting is only a description,
+        the internal state of the optimizer is not saved.
+
+        Args:
+            path (str): Path of the checkpoint.
+        """
+        rng_state = np.random.get_state()
+        save_checkpoint(
+            path,
+            optimal_params=self._result.state_params,
+            energies=self._result.state_energies,
+            current_params=np.zeros(0)
+            if self._current_params is None
+            else self._current_params,
+            current_cost=self._current_cost,
+            n_evaluations=self._n_evaluations,
+            seed=-1 if self.seed is None else self.seed,
+            optimizer=str(getattr(self.optimizer, "setting", type(self.optimizer))),
+            rng_keys=rng_state[1],
+            rng_pos=rng_state[2],
+            rng_has_gauss=rng_state[3],
+            rng_cached_gaussian=rng_state[4],
+        )
+
+    def resume(self, path: str, verbose: int = 1) -> None:
+        """Resumes a run from a checkpoint, the completed states are rebuilt from
+        their parameters and the current state restarts from its best parameters.
+
+        The internal state of the optimizer is not checkpointed, so the current
+        state restarts its optimization from the best parameters found instead
+        of resuming from the last iteration.
+
+        Args:
+            path (str): Path of the checkpoint.
+            verbose (int, optional): Verbosity. Defaults to 1.
+        """
+        checkpoint = load_checkpoint(path)
+
+        # Check if the number of parameters is compatible
+        assert (
+            checkpoint["optimal_params"].shape[1] == self.n_parameters
+        ), "The number of parameters don't match"
+
+        n_states = len(checkpoint["optimal_params"])
+        if n_states > self.n_excited_states:
+            raise ValueError(
+                f"The checkpoint has {n_states} states, more than the {self.n_excited_states} states of the run."
+            )
+
+        self._reset()
+        for optimal_params, energy in zip(
+            checkpoint["optimal_params"], checkpoint["energies"]
+        ):
+            self._add_state(optimal_params, energy)
+
+        if self.seed is None:
+            np.random.set_state(
+                (
+                    "MT19937",
+                    checkpoint["rng_keys"],
+                    int(checkpoint["rng_pos"]),
+                    int(checkpoint["rng_has_gauss"]),
+                    float(checkpoint["rng_cached_gaussian"]),
+                )
+            )
+
+        if checkpoint["current_params"].size > 0:
+            self._resume_point = checkpoint["current_params"]
+
+        self._run_states(verbose)
+
+    def gradient(self, params: list) -> np.array:
+        """Evaluate the gradient of the cost function of VQD with the
+        parameter-shift rule.
+
+        The energies of all the shifted parameters are evaluated in one batch
+        and the overlaps of all the shifted states with the previous states are
+        sent to the backend in a single submission.
+
+        Args:
+            params (list): Parameter values for the ansatz.
+
+        Returns:
+            np.array: Gradient of the cost function.
+        """
+        if self.profiler is not None:
+            self.profiler.start()
+
+        shifted = self._gradient_engine.shifted_parameters(params)
 
         # Hamiltonian
-        hamiltonian_eval = sample_hamiltonian(
-            hamiltonian=self.hamiltonian, ansatz=qc, backend=self.backend
+        values = self._profiled(
+            "energy", self._energy_evaluator.evaluate_batch, shifted
         )
 
         # Fidelity
-        fidelity = 0.0
-        if len(self.states) != 0:
-            for state in self.states:
-                if self.overlap_method == "dswap":
-                    swap = measure_dswap_test(qc, state, self.backend, self.NUM_SHOTS)
-                elif self.overlap_method == "swap":
-                    swap = measure_swap_test(qc, state, self.backend, self.NUM_SHOTS)
-                elif self.overlap_method == "amplitude":
-                    swap = measure_amplitude_transition_test(
-                        qc, state, self.backend, self.NUM_SHOTS
-                    )
-                fidelity += swap
-
-                if self._debug:
-                    print(fidelity)
+        if self._result.num_found != 0:
+            fidelities = self._profiled("overlap", self._fidelities, shifted)
+            values = values + self.BETA * fidelities.sum(axis=1)
 
-        # Get the cost function
-        cost = hamiltonian_eval + self.BETA * fidelity
+        if self.profiler is not None:
+            self.profiler.stop(kind="gradient", state=self._result.num_found)
 
-        return cost
+        return self._gradient_engine.gradient_from_values(values)
 
-    def optimizer_run(self):
+    @property
+    def multistart_statistics(self) -> list:
+        """Returns the statistics of the starts of each state.
 
-        # Random initialization
-        params = np.random.rand(self.n_parameters)
+        Returns:
+            list: list with a dictionary for each state, see utils.multistart_statistics.
+        """
+        return self._multistart
+
+    def _initial_points(self) -> np.array:
+        """Random initial points of the starts for the next state."""
+        if self.seed is None:
+            rng = np.random
+        else:
+            rng = np.random.RandomState(self.seed + self._result.num_found)
+        return rng.rand(self.n_starts, self.n_parameters)
+
+    def _objective(self, params: list) -> float:
+        """Cost function given to the optimizer, cached if there is a cache."""
+        if self.cost_cache is None:
+            return self.cost_function(params)
+        return self.cost_cache.get_or_evaluate(self.cost_function, params)
+
+    def _optimize(self, initial_point: np.array) -> (np.array, float, int):
+        """Minimizes the cost function from an initial point.
 
-        optimal_params, energy, n_iters = self.optimizer.optimize(
+        Args:
+            initial_point (np.array): Initial parameters.
+
+        Returns:
+            np.array: Optimal parameters.
+            float: Optimal value of the cost function.
+            int: Number of iterations.
+        """
+        return self.optimizer.optimize(
             num_vars=self.n_parameters,
-            objective_function=self.cost_function,
-            initial_point=params,
+            objective_function=self._objective,
+            gradient_function=self.gradient
+            if self._gradient_engine is not None
+            else None,
+            initial_point=initial_point,
         )
 
-        # Logging the energies and states
-        # TODO: Change to an ordered list.
+    def _worker_settings(self) -> dict:
+        """Picklable arguments that rebuild the algorithm on a worker process,
+        without the profiler, cache, checkpoints or pool."""
+        return {
+            "hamiltonian": self.hamiltonian,
+            "ansatz": self.ansatz,
+            "n_excited_states": self.n_excited_states - 1,
+            "beta": self.BETA,
+            "optimizer": self.optimizer,
+            "backend": backend_config(self.backend),
+            "overlap_method": self.overlap_method,
+            "num_shots": self.NUM_SHOTS,
+            "shot_budget": self.shot_budget,
+            "gradient_method": self.gradient_method,
+            "overlap_tolerance": self.overlap_tolerance,
+        }
+
+    def optimizer_run(self) -> dict:
+        """Finds the next state, running the starts in a pool of processes.
+
+        Returns:
+            dict: Statistics of the starts, see utils.multistart_statistics.
+        """
+        # Random initialization
+        initial_points = self._initial_points()
+
+        # The cost function changes with the previous states
+        if self.cost_cache is not None:
+            self.cost_cache.clear()
+
+        # The first start continues from the resumed parameters
+        if self._resume_point is not None:
+            initial_points[0] = self._resume_point
+            self._resume_point = None
+
+        if self.n_jobs == 1 or len(initial_points) <= 1:
+            results = [self._optimize(point) for point in initial_points]
+        else:
+            worker = partial(
+                _optimize_start, self._worker_settings(), self._result.state_params
+            )
+            results = parallel_map(worker, initial_points, self.n_jobs)
+
+        statistics = multistart_statistics(initial_points, results)
+        optimal_params, energy, _ = results[statistics["best"]]
 
-        self._energies.append(energy)
-        self._states.append(self._apply_varform_params(optimal_params))
+        self._multistart.append(statistics)
+        self._add_state(optimal_params, energy)
+
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(self.checkpoint_path)
+
+        return statistics
+
+    def _add_state(self, optimal_params: np.array, energy: float) -> None:
+        """Logs a converged state and prepares its overlaps."""
+        # Logging the energies and optimal parameters
+        self._result.add_state(self._result.num_found, optimal_params, energy)
+
+        # Progress of the next state
+        self._n_evaluations = 0
+        self._current_params = None
+        self._current_cost = np.inf
+
+        # Each converged state is simulated or transpiled only once
+        if self._compiled_ansatz is not None:
+            self._statevectors = np.vstack(
+                [self._statevectors, self._compiled_ansatz.statevector(optimal_params)]
+            )
+        else:
+            self._overlap_templates.append(
+                OverlapTemplate(
+                    self.ansatz,
+                    self._apply_varform_params(optimal_params),
+                    self.backend,
+                    self.overlap_method,
+                )
+            )
 
     def _reset(self):
         """Resets the energies and states helper variables."""
 
-        self._energies = []
-        self._states = []
+        self._result = RunResult(self.n_excited_states, self.n_parameters)
+        self._multistart = []
+        self._statevectors = np.zeros((0, 2**self.n_qubits), dtype=complex)
+        self._overlap_templates = []
+        self._n_evaluations = 0
+        self._current_params = None
+        self._current_cost = np.inf
+        self._resume_point = None
 
     def run(self, verbose: int = 1):
 
         self._reset()
+        self._run_states(verbose)
 
-        for i in range(self.n_excited_states):
+    def _run_states(self, verbose: int) -> None:
+        """Finds the states that were not computed yet."""
+        if verbose == 1 and self.overlap_costs is not None:
+            print(f"Using the {self.overlap_method} overlap method")
+
+        for i in range(self._result.num_found, self.n_excited_states):
 
             if verbose == 1:
                 print(f"Calculating excited state {i}")
 
             self.optimizer_run()
+
+
+def _optimize_start(
+    settings: dict, previous_params: np.array, initial_point: np.array
+) -> (np.array, float, int):
+    """Minimizes the VQD cost function of the next state from an initial point
+    on a worker process.
+
+    Args:
+        settings (dict): Picklable arguments of VQD, see VQD._worker_settings.
+        previous_params (np.array): Optimal parameters of the states already found.
+        initial_point (np.array): Initial parameters.
+
+    Returns:
+        np.array: Optimal parameters.
+        float: Optimal value of the cost function.
+        int: Number of iterations.
+    """
+    settings = dict(settings, backend=backend_from_config(settings["backend"]))
+    vqd = VQD(**settings)
+    for params in previous_params:
+        vqd._add_state(params, np.nan)
+    return vqd._optimize(initial_point)